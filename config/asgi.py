@@ -12,5 +12,6 @@ import os
 from django.core.asgi import get_asgi_application
 
 os.environ.setdefault('DJANGO_SETTINGS_MODULE', 'config.settings')
+os.environ.setdefault('ASYNC_VIEWS', '1')  # 피드/좋아요/검색/OAuth 콜백을 async 뷰로 (settings.ASYNC_VIEWS)
 
 application = get_asgi_application()
@@ -10,6 +10,7 @@ For the full list of settings and their values, see
 https://docs.djangoproject.com/en/5.1/ref/settings/
 """
 import json
+import os
 from pathlib import Path
 
 # Build paths inside the project like this: BASE_DIR / 'subdir'.
@@ -54,6 +55,7 @@ INSTALLED_APPS = [
     # own
     'member',
     'post',
+    'job',
     # 3rd party
     'django_extensions',
 ]
@@ -64,6 +66,7 @@ MIDDLEWARE = [
     'django.middleware.common.CommonMiddleware',
     'django.middleware.csrf.CsrfViewMiddleware',
     'django.contrib.auth.middleware.AuthenticationMiddleware',
+    'utils.replica.ReplicaStickinessMiddleware',
     'django.contrib.messages.middleware.MessageMiddleware',
     'django.middleware.clickjacking.XFrameOptionsMiddleware',
 ]
@@ -92,13 +95,47 @@ WSGI_APPLICATION = 'config.wsgi.application'
 # Database
 # https://docs.djangoproject.com/en/5.1/ref/settings/#databases
 
+# SQLite 동시성 설정
+# - WAL: 읽기와 쓰기가 서로 막지 않음 (journal_mode 는 DB 파일에 저장됨)
+# - synchronous=NORMAL: WAL 에서는 커밋마다 fsync 하지 않아도 DB 가 깨지지 않음
+# - mmap_size / cache_size: 읽기를 메모리에서 처리 (cache_size 음수는 KB 단위)
+# - busy_timeout / timeout: 다른 연결이 쓰는 중이면 바로 'database is locked' 대신 기다림
+# - transaction_mode=IMMEDIATE: 트랜잭션 시작 시 쓰기 잠금을 잡음. DEFERRED 는 읽다가 쓰기로 바꿀 때
+#   다른 쓰기와 부딪히면 기다리지 않고 바로 실패함
+SQLITE_INIT_COMMAND = ';'.join([
+    'PRAGMA journal_mode=WAL',
+    'PRAGMA synchronous=NORMAL',
+    'PRAGMA mmap_size=134217728',
+    'PRAGMA cache_size=-20000',
+    'PRAGMA busy_timeout=5000',
+])
+
 DATABASES = {
     'default': {
         'ENGINE': 'django.db.backends.sqlite3',
         'NAME': BASE_DIR / 'db.sqlite3',
+        'OPTIONS': {
+            'init_command': SQLITE_INIT_COMMAND,
+            'transaction_mode': 'IMMEDIATE',
+            'timeout': 20,
+        },
     }
 }
 
+# 읽기 전용 화면(피드/프로필/검색)의 조회용 DB (utils/replica.py)
+# REPLICA_DB_NAME 환경 변수가 있을 때만 사용하고, 없으면 모든 조회가 default 로 감
+# 로컬에서 복제본을 흉내 내려면
+#   REPLICA_DB_NAME=db_replica.sqlite3 python manage.py sync_replica  로 복사본을 만들고 같은 환경 변수로 서버 실행
+if os.environ.get('REPLICA_DB_NAME'):
+    DATABASES['replica'] = {
+        **DATABASES['default'],
+        'NAME': os.environ['REPLICA_DB_NAME'],
+        'TEST': {'MIRROR': 'default'},
+    }
+DATABASE_ROUTERS = ['utils.replica.ReplicaRouter']
+# 쓰기 요청 후 이 시간(초) 동안은 그 유저의 읽기를 primary 로 보냄 (방금 쓴 글이 바로 보이도록)
+REPLICA_STICKY_SECONDS = 10
+
 
 # Password validation
 # https://docs.djangoproject.com/en/5.1/ref/settings/#auth-password-validators
@@ -148,6 +185,14 @@ STATIC_ROOT = BASE_DIR / '.static_root'
 # Media
 MEDIA_URL = '/media/'
 MEDIA_ROOT = BASE_DIR / 'media'
+# 업로드 파일 전송 방식 (utils/media.py)
+#   None: Django 가 직접 전송 (FileResponse + Range)
+#   'x-accel-redirect': nginx 가 MEDIA_ACCEL_PREFIX 위치에서 전송 (config/prod.py 참고)
+#   'x-sendfile': Apache(mod_xsendfile)/lighttpd 가 전송
+MEDIA_SENDFILE = None
+MEDIA_ACCEL_PREFIX = '/_media/'
+# 파일 이름이 내용의 해시값이라 내용이 바뀌지 않는 경로 (Cache-Control: immutable)
+MEDIA_IMMUTABLE_PREFIXES = ('post/variants/',)
 
 # Default primary key field type
 # https://docs.djangoproject.com/en/5.1/ref/settings/#default-auto-field
@@ -188,4 +233,38 @@ NAVER_CLIENT_ID = SECRET["naver"]["client_id"]
 NAVER_CLIENT_SECRET = SECRET["naver"]["secret"]
 
 GITHUB_CLIENT_ID = SECRET["github"]["client_id"]
-GITHUB_CLIENT_SECRET = SECRET["github"]["secret"]
\ No newline at end of file
+GITHUB_CLIENT_SECRET = SECRET["github"]["secret"]
+
+# Timeline
+# 팔로워가 이 숫자 이상인 계정은 글 작성 시 팔로워 타임라인에 넣지 않고(fan-out 생략)
+# 피드를 읽을 때 직접 가져와서 합침
+TIMELINE_FANOUT_LIMIT = 10000
+
+# Job queue
+# True 이면 워커 없이 커밋 직후 바로 실행 (테스트용)
+JOB_QUEUE_EAGER = False
+
+# Async views
+# 피드/좋아요/검색/OAuth 콜백을 async 뷰로 연결 (post/async_views.py, member/oauth_async_views.py)
+# ASGI 로 실행하면 켜짐 (config/asgi.py)  예: uvicorn config.asgi:application --workers 4
+# WSGI(runserver, gunicorn)에서는 async 뷰가 요청마다 이벤트 루프를 따로 돌려서 오히려 느리므로 끔
+ASYNC_VIEWS = os.environ.get('ASYNC_VIEWS') == '1'
+
+# Cache
+# fragments: 피드 글 카드 HTML 캐시 ({% cache ... using="fragments" %})
+# 키에 글 버전이 들어가므로 삭제 없이 버전만 올려서 무효화함. 백엔드는 바꿔 끼울 수 있음
+#   파일: 'django.core.cache.backends.filebased.FileBasedCache', LOCATION: BASE_DIR / '.cache' / 'fragments'
+#   Redis: 'django.core.cache.backends.redis.RedisCache', LOCATION: 'redis://127.0.0.1:6379/1'
+# 로그인하지 않은 유저의 피드/프로필 페이지 캐시 시간(초). 0 이면 캐시하지 않음 (utils/pagecache.py)
+PAGE_CACHE_TIMEOUT = 60 * 10
+
+CACHES = {
+    'default': {
+        'BACKEND': 'django.core.cache.backends.locmem.LocMemCache',
+    },
+    'fragments': {
+        'BACKEND': 'django.core.cache.backends.locmem.LocMemCache',
+        'LOCATION': 'fragments',
+        'OPTIONS': {'MAX_ENTRIES': 10000},
+    },
+}
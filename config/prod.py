@@ -3,4 +3,25 @@ from .base import *
 DEBUG = False
 ALLOWED_HOSTS = [
     '13.125.182.248'
-]
\ No newline at end of file
+]
+
+# 요청마다 DB 연결을 새로 열지 않고 재사용 (연결할 때마다 PRAGMA 를 다시 실행하지 않음)
+DATABASES['default']['CONN_MAX_AGE'] = 60 * 10
+DATABASES['default']['CONN_HEALTH_CHECKS'] = True
+if 'replica' in DATABASES:
+    DATABASES['replica']['CONN_MAX_AGE'] = 60 * 10
+    DATABASES['replica']['CONN_HEALTH_CHECKS'] = True
+
+# 여러 프로세스(gunicorn worker)가 같은 카드 캐시를 쓰도록 파일 캐시 사용
+CACHES['fragments'] = {
+    'BACKEND': 'django.core.cache.backends.filebased.FileBasedCache',
+    'LOCATION': BASE_DIR / '.cache' / 'fragments',
+    'OPTIONS': {'MAX_ENTRIES': 10000},
+}
+
+# 업로드 파일은 nginx 가 전송 (utils/media.py 에서 경로 확인/캐시 헤더만 설정)
+#   location /_media/ {
+#       internal;
+#       alias /path/to/pystagram/media/;
+#   }
+MEDIA_SENDFILE = 'x-accel-redirect'
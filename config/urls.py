@@ -14,26 +14,37 @@ Including another URLconf
     1. Import the include() function: from django.urls import include, path
     2. Add a URL to urlpatterns:  path('blog/', include('blog.urls'))
 """
+import re
+
 from django.conf import settings
-from django.conf.urls.static import static
 from django.contrib import admin
 from django.contrib.auth.views import LogoutView
-from django.urls import path, include
+from django.urls import path, include, re_path
 from django.views.generic import TemplateView
 
 from member import views as member_views
 from post import views as post_views
+from utils import media
+
+# ASGI 로 실행할 때는 async 뷰 사용 (settings.ASYNC_VIEWS)
+if settings.ASYNC_VIEWS:
+    from post import async_views
+
+    feed_view, toggle_like_view, search_view = async_views.feed, async_views.toggle_like, async_views.search
+else:
+    feed_view, toggle_like_view, search_view = post_views.PostListView.as_view(), post_views.toggle_like, post_views.search
 
 urlpatterns = [
     path('admin/', admin.site.urls),
 
     # post
-    path('', post_views.PostListView.as_view(), name='main'),
+    path('', feed_view, name='main'),
     path('create/', post_views.PostCreateView.as_view(), name='create'),
     path('<int:pk>/update/', post_views.PostUpdateView.as_view(), name='update'),
 
     # Like
-    path('like/', post_views.toggle_like, name='toggle_like'),
+    path('like/', toggle_like_view, name='toggle_like'),
+    path('like/sync/', post_views.sync_likes, name='sync_likes'),
 
     # Auth
     path('signup/', member_views.SignupView.as_view(), name='signup'),
@@ -44,7 +55,8 @@ urlpatterns = [
     # path('account', include('django.contrib.auth.urls')),
 
     # search
-    path('search/', post_views.search, name='search'),
+    path('search/', search_view, name='search'),
+    path('search/autocomplete/', member_views.nickname_autocomplete, name='nickname_autocomplete'),
 
     # include
     path('comment/', include('post.comment_urls')),
@@ -52,6 +64,7 @@ urlpatterns = [
     path('oauth/', include('member.oauth_urls')),
 ]
 
-
-if settings.DEBUG:
-    urlpatterns += static(settings.MEDIA_URL, document_root=settings.MEDIA_ROOT)
\ No newline at end of file
+# 업로드 파일 (DEBUG 와 관계없이. 배포 환경에서는 settings.MEDIA_SENDFILE 로 웹 서버가 전송)
+urlpatterns += [
+    re_path(r'^%s(?P<path>.+)$' % re.escape(settings.MEDIA_URL.lstrip('/')), media.serve, name='media'),
+]
\ No newline at end of file
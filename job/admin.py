@@ -0,0 +1,15 @@
+from django.contrib import admin
+
+from job.models import Job, Outbox
+
+
+@admin.register(Job)
+class JobAdmin(admin.ModelAdmin):
+    list_display = ['task', 'status', 'attempts', 'run_at', 'updated_at']
+    list_filter = ['status']
+
+
+@admin.register(Outbox)
+class OutboxAdmin(admin.ModelAdmin):
+    list_display = ['subject', 'status', 'attempts', 'send_at', 'sent_at']
+    list_filter = ['status']
@@ -0,0 +1,32 @@
+import os
+import socket
+import time
+
+from django.core.management.base import BaseCommand
+from django.db import close_old_connections
+
+from job import outbox
+
+
+class Command(BaseCommand):
+    help = '보낼 메일함(outbox)에 쌓인 메일을 SMTP 연결 하나로 모아서 발송합니다.'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--batch', type=int, default=100, help='연결 하나로 보낼 최대 메일 수')
+        parser.add_argument('--rate', type=float, default=None, help='초당 최대 발송 수')
+        parser.add_argument('--loop', action='store_true', help='종료하지 않고 계속 발송')
+        parser.add_argument('--poll', type=float, default=2.0, help='보낼 메일이 없을 때 대기 시간(초)')
+
+    def handle(self, *args, **options):
+        worker = f'{socket.gethostname()}:{os.getpid()}'
+
+        while True:
+            close_old_connections()
+            sent, failed = outbox.deliver(worker, limit=options['batch'], rate=options['rate'])
+            if sent or failed:
+                self.stdout.write(f'sent {sent}, failed {failed}')
+
+            if not options['loop']:
+                break
+            if not (sent or failed):
+                time.sleep(options['poll'])
@@ -0,0 +1,96 @@
+import multiprocessing
+import os
+import signal
+import socket
+import time
+from datetime import timedelta
+
+from django.core.management.base import BaseCommand
+from django.db import close_old_connections, connections
+from django.utils import timezone
+
+from job import queue
+from job.models import Job
+
+
+def work(number, options, stop):
+    # 자식 프로세스마다 DB 연결을 새로 맺음
+    connections.close_all()
+    # 종료는 부모 프로세스가 stop 이벤트로 알려줌
+    # systemd/docker 는 프로세스 그룹 전체에 SIGTERM 을 보내므로 자식은 무시하고 진행 중인 작업을 끝냄
+    signal.signal(signal.SIGINT, signal.SIG_IGN)
+    signal.signal(signal.SIGTERM, signal.SIG_IGN)
+    worker = f'{socket.gethostname()}:{os.getpid()}:{number}'
+
+    while not stop.is_set():
+        close_old_connections()
+        jobs = queue.claim(worker, limit=options['batch'], timeout=options['timeout'])
+
+        if not jobs:
+            if options['burst']:
+                break
+            stop.wait(options['poll'])
+            continue
+
+        for job in jobs:
+            queue.run(job)
+
+    connections.close_all()
+
+
+class Command(BaseCommand):
+    help = 'DB 작업 큐의 작업을 실행하는 워커를 띄웁니다.'
+
+    def add_arguments(self, parser):
+        parser.add_argument('-n', '--processes', type=int, default=2, help='워커 프로세스 수')
+        parser.add_argument('--batch', type=int, default=10, help='한 번에 가져올 작업 수')
+        parser.add_argument('--poll', type=float, default=1.0, help='큐가 비었을 때 대기 시간(초)')
+        parser.add_argument('--timeout', type=int, default=queue.VISIBILITY_TIMEOUT, help='visibility timeout(초)')
+        parser.add_argument('--burst', action='store_true', help='큐가 비면 종료')
+        parser.add_argument('--purge', type=int, default=7, help='완료된 작업을 며칠 뒤에 지울지 (0이면 지우지 않음)')
+
+    def handle(self, *args, **options):
+        if options['purge']:
+            deleted, _ = Job.objects.filter(
+                status=Job.STATUS_DONE, updated_at__lt=timezone.now() - timedelta(days=options['purge'])
+            ).delete()
+            self.stdout.write(f'purged {deleted} done jobs')
+
+        # fork 하기 전에 부모의 DB 연결을 닫아서 자식끼리 연결을 공유하지 않도록 함
+        connections.close_all()
+
+        # 자식은 부모에서 초기화된 Django 상태를 그대로 물려받아야 하므로 fork 로 띄움
+        # (Python 3.14 부터 Linux 기본값이 forkserver)
+        context = multiprocessing.get_context('fork')
+        stop = context.Event()
+
+        def start(number):
+            process = context.Process(target=work, args=(number, options, stop), daemon=True)
+            process.start()
+            return process
+
+        processes = [start(number) for number in range(options['processes'])]
+        self.stdout.write(f'started {len(processes)} workers')
+
+        def shutdown(signum, frame):
+            self.stdout.write('stopping workers...')
+            stop.set()
+
+        signal.signal(signal.SIGTERM, shutdown)
+        signal.signal(signal.SIGINT, shutdown)
+
+        self.supervise(start, processes, stop)
+
+    def supervise(self, start, processes, stop, interval=1.0):
+        # 자식이 비정상 종료하면(예외, OOM killer 등) 같은 번호로 다시 띄움
+        # 정상 종료(--burst 에서 큐가 빈 경우)나 stop 이후에는 다시 띄우지 않음
+        # 시그널 핸들러가 stop.set() 을 부르므로 부모는 stop.wait() 대신 sleep 으로 기다림 (같은 락을 두 번 잡지 않도록)
+        while not stop.is_set() and any(process.exitcode != 0 for process in processes):
+            for number, process in enumerate(processes):
+                if process.exitcode not in (None, 0) and not stop.is_set():
+                    self.stdout.write(f'worker {number} exited with {process.exitcode}, restarting')
+                    processes[number] = start(number)
+            time.sleep(interval)
+
+        for process in processes:
+            process.join()
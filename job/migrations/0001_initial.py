@@ -0,0 +1,38 @@
+# Generated by Django 5.1.15 on 2026-10-18 08:46
+
+import django.utils.timezone
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    initial = True
+
+    dependencies = [
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='Job',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('created_at', models.DateTimeField(auto_now_add=True, verbose_name='작성일자')),
+                ('updated_at', models.DateTimeField(auto_now=True, verbose_name='수정일자')),
+                ('task', models.CharField(max_length=200, verbose_name='작업')),
+                ('args', models.JSONField(default=list, verbose_name='인자')),
+                ('kwargs', models.JSONField(default=dict, verbose_name='키워드 인자')),
+                ('status', models.CharField(choices=[('queued', '대기'), ('running', '실행중'), ('done', '완료'), ('failed', '실패')], default='queued', max_length=10, verbose_name='상태')),
+                ('attempts', models.PositiveIntegerField(default=0, verbose_name='시도 횟수')),
+                ('max_attempts', models.PositiveIntegerField(default=5, verbose_name='최대 시도 횟수')),
+                ('run_at', models.DateTimeField(default=django.utils.timezone.now, verbose_name='실행 시각')),
+                ('locked_by', models.CharField(blank=True, max_length=100, verbose_name='워커')),
+                ('locked_until', models.DateTimeField(blank=True, null=True, verbose_name='잠금 만료 시각')),
+                ('last_error', models.TextField(blank=True, verbose_name='마지막 오류')),
+            ],
+            options={
+                'verbose_name': '작업',
+                'verbose_name_plural': '작업 목록',
+                'indexes': [models.Index(fields=['status', 'run_at'], name='job_status_run_at_idx'), models.Index(fields=['locked_by'], name='job_locked_by_idx')],
+            },
+        ),
+    ]
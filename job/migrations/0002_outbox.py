@@ -0,0 +1,38 @@
+# Generated by Django 5.1.15 on 2026-10-18 08:47
+
+import django.utils.timezone
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('job', '0001_initial'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='Outbox',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('created_at', models.DateTimeField(auto_now_add=True, verbose_name='작성일자')),
+                ('updated_at', models.DateTimeField(auto_now=True, verbose_name='수정일자')),
+                ('subject', models.CharField(max_length=255, verbose_name='제목')),
+                ('message', models.TextField(verbose_name='내용')),
+                ('from_email', models.CharField(max_length=255, verbose_name='보내는 사람')),
+                ('to', models.JSONField(default=list, verbose_name='받는 사람')),
+                ('status', models.CharField(choices=[('pending', '대기'), ('sending', '발송중'), ('sent', '발송완료'), ('failed', '실패')], default='pending', max_length=10, verbose_name='상태')),
+                ('attempts', models.PositiveIntegerField(default=0, verbose_name='시도 횟수')),
+                ('send_at', models.DateTimeField(default=django.utils.timezone.now, verbose_name='발송 시각')),
+                ('locked_by', models.CharField(blank=True, max_length=100, verbose_name='발송자')),
+                ('locked_until', models.DateTimeField(blank=True, null=True, verbose_name='잠금 만료 시각')),
+                ('sent_at', models.DateTimeField(blank=True, null=True, verbose_name='발송 완료 시각')),
+                ('last_error', models.TextField(blank=True, verbose_name='마지막 오류')),
+            ],
+            options={
+                'verbose_name': '메일',
+                'verbose_name_plural': '메일 목록',
+                'indexes': [models.Index(fields=['status', 'send_at'], name='outbox_status_send_at_idx'), models.Index(fields=['locked_by'], name='outbox_locked_by_idx')],
+            },
+        ),
+    ]
@@ -0,0 +1,84 @@
+from django.db import models
+from django.utils import timezone
+
+from utils.models import TimestampModel
+
+
+# 백그라운드 작업 큐
+# 별도의 브로커(Redis, RabbitMQ) 없이 DB 테이블을 큐로 사용함.
+# 뷰에서는 job.queue.enqueue() 로 행만 넣고 바로 응답하고,
+# python manage.py runworker 가 행을 가져가서(claim) 실행함.
+class Job(TimestampModel):
+    STATUS_QUEUED = 'queued'
+    STATUS_RUNNING = 'running'
+    STATUS_DONE = 'done'
+    STATUS_FAILED = 'failed'
+    STATUS_CHOICES = [
+        (STATUS_QUEUED, '대기'),
+        (STATUS_RUNNING, '실행중'),
+        (STATUS_DONE, '완료'),
+        (STATUS_FAILED, '실패'),
+    ]
+
+    task = models.CharField('작업', max_length=200)  # 실행할 함수 경로 ex) post.tasks.index_post_tags
+    args = models.JSONField('인자', default=list)
+    kwargs = models.JSONField('키워드 인자', default=dict)
+    status = models.CharField('상태', max_length=10, choices=STATUS_CHOICES, default=STATUS_QUEUED)
+    attempts = models.PositiveIntegerField('시도 횟수', default=0)
+    max_attempts = models.PositiveIntegerField('최대 시도 횟수', default=5)
+    run_at = models.DateTimeField('실행 시각', default=timezone.now)  # 재시도할 때는 뒤로 미룸
+    # 워커가 가져간 작업은 locked_until 까지 다른 워커에게 보이지 않음(visibility timeout)
+    # 워커가 죽어서 시간이 지나면 다른 워커가 다시 가져감
+    locked_by = models.CharField('워커', max_length=100, blank=True)
+    locked_until = models.DateTimeField('잠금 만료 시각', null=True, blank=True)
+    last_error = models.TextField('마지막 오류', blank=True)
+
+    def __str__(self):
+        return f'[{self.status}] {self.task}'
+
+    class Meta:
+        verbose_name = '작업'
+        verbose_name_plural = '작업 목록'
+        indexes = [
+            models.Index(fields=['status', 'run_at'], name='job_status_run_at_idx'),
+            models.Index(fields=['locked_by'], name='job_locked_by_idx'),
+        ]
+
+
+# 보낼 메일함(outbox)
+# 요청 안에서는 행만 넣고, python manage.py deliver_outbox 가
+# SMTP 연결 하나로 여러 통을 모아서 보냄
+class Outbox(TimestampModel):
+    STATUS_PENDING = 'pending'
+    STATUS_SENDING = 'sending'
+    STATUS_SENT = 'sent'
+    STATUS_FAILED = 'failed'
+    STATUS_CHOICES = [
+        (STATUS_PENDING, '대기'),
+        (STATUS_SENDING, '발송중'),
+        (STATUS_SENT, '발송완료'),
+        (STATUS_FAILED, '실패'),
+    ]
+
+    subject = models.CharField('제목', max_length=255)
+    message = models.TextField('내용')
+    from_email = models.CharField('보내는 사람', max_length=255)
+    to = models.JSONField('받는 사람', default=list)
+    status = models.CharField('상태', max_length=10, choices=STATUS_CHOICES, default=STATUS_PENDING)
+    attempts = models.PositiveIntegerField('시도 횟수', default=0)
+    send_at = models.DateTimeField('발송 시각', default=timezone.now)  # 재시도할 때는 뒤로 미룸
+    locked_by = models.CharField('발송자', max_length=100, blank=True)
+    locked_until = models.DateTimeField('잠금 만료 시각', null=True, blank=True)
+    sent_at = models.DateTimeField('발송 완료 시각', null=True, blank=True)
+    last_error = models.TextField('마지막 오류', blank=True)
+
+    def __str__(self):
+        return f'[{self.status}] {self.subject} -> {", ".join(self.to)}'
+
+    class Meta:
+        verbose_name = '메일'
+        verbose_name_plural = '메일 목록'
+        indexes = [
+            models.Index(fields=['status', 'send_at'], name='outbox_status_send_at_idx'),
+            models.Index(fields=['locked_by'], name='outbox_locked_by_idx'),
+        ]
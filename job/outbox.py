@@ -0,0 +1,115 @@
+import smtplib
+import time
+import uuid
+from datetime import timedelta
+
+from django.core.mail import EmailMessage, get_connection
+from django.db.models import F, Q
+from django.utils import timezone
+
+from job.models import Outbox
+from job.queue import backoff
+
+MAX_ATTEMPTS = 5
+LOCK_TIMEOUT = 300  # 발송 도중 프로세스가 죽으면 이 시간 뒤에 다시 보냄(초)
+
+
+def claim(worker, limit):
+    now = timezone.now()
+    sendable = (
+        Q(status=Outbox.STATUS_PENDING, send_at__lte=now)
+        | Q(status=Outbox.STATUS_SENDING, locked_until__lt=now)
+    )
+
+    ids = list(Outbox.objects.filter(sendable).order_by('send_at', 'id').values_list('pk', flat=True)[:limit])
+    if not ids:
+        return []
+
+    token = f'{worker}:{uuid.uuid4().hex}'
+    Outbox.objects.filter(sendable, pk__in=ids).update(
+        status=Outbox.STATUS_SENDING,
+        locked_by=token,
+        locked_until=now + timedelta(seconds=LOCK_TIMEOUT),
+        attempts=F('attempts') + 1,
+    )
+    return list(Outbox.objects.filter(locked_by=token).order_by('send_at', 'id'))
+
+
+def retry(email, error):
+    mine = Outbox.objects.filter(pk=email.pk, locked_by=email.locked_by)
+    if email.attempts >= MAX_ATTEMPTS:
+        mine.update(status=Outbox.STATUS_FAILED, last_error=repr(error), locked_by='', locked_until=None)
+    else:
+        mine.update(
+            status=Outbox.STATUS_PENDING,
+            send_at=timezone.now() + backoff(email.attempts),
+            last_error=repr(error),
+            locked_by='',
+            locked_until=None,
+        )
+
+
+def release(emails):
+    # 보내지 못한 메일을 시도 횟수를 올리지 않고 바로 다시 보낼 수 있게 돌려놓음
+    for email in emails:
+        Outbox.objects.filter(pk=email.pk, locked_by=email.locked_by).update(
+            status=Outbox.STATUS_PENDING, attempts=F('attempts') - 1, locked_by='', locked_until=None
+        )
+
+
+def send(email, connection):
+    EmailMessage(email.subject, email.message, email.from_email, email.to, connection=connection).send()
+
+
+# 대기 중인 메일을 최대 limit 통 보냄
+# 메일마다 SMTP/TLS 연결을 새로 맺지 않고 연결 하나로 이어서 보냄
+# rate: 초당 최대 발송 수 (메일 서버의 발송 제한을 넘지 않도록)
+def deliver(worker='outbox', limit=100, rate=None):
+    emails = claim(worker, limit)
+    if not emails:
+        return 0, 0
+
+    connection = get_connection()
+    try:
+        connection.open()
+    except Exception as e:  # 메일 서버에 연결할 수 없으면 전부 나중에 다시 시도
+        for email in emails:
+            retry(email, e)
+        return 0, len(emails)
+
+    interval = 1 / rate if rate else 0
+    sent = failed = 0
+    try:
+        for index, email in enumerate(emails):
+            started = time.monotonic()
+
+            try:
+                try:
+                    send(email, connection)
+                except smtplib.SMTPServerDisconnected:
+                    # 메일 서버가 연결을 끊으면 한 번 다시 연결해서 같은 메일을 다시 보냄
+                    # 그래도 안 되면 메일 문제가 아니므로 남은 메일은 시도 횟수를 올리지 않고 돌려놓고 멈춤
+                    try:
+                        connection.close()
+                        connection.open()
+                        send(email, connection)
+                    except Exception:
+                        release(emails[index:])
+                        break
+            except Exception as e:
+                failed += 1
+                retry(email, e)
+            else:
+                sent += 1
+                Outbox.objects.filter(pk=email.pk, locked_by=email.locked_by).update(
+                    status=Outbox.STATUS_SENT, sent_at=timezone.now(), locked_by='', locked_until=None
+                )
+
+            # 발송 속도 제한
+            elapsed = time.monotonic() - started
+            if elapsed < interval:
+                time.sleep(interval - elapsed)
+    finally:
+        connection.close()
+
+    return sent, failed
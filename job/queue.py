@@ -0,0 +1,96 @@
+import random
+import traceback
+import uuid
+from datetime import timedelta
+
+from django.conf import settings
+from django.db import transaction
+from django.db.models import F, Q
+from django.utils import timezone
+from django.utils.module_loading import import_string
+
+from job.models import Job
+
+VISIBILITY_TIMEOUT = 300  # 워커가 작업을 가져간 뒤 다른 워커에게 숨기는 시간(초)
+BACKOFF_BASE = 10  # 재시도 간격(초) 10, 20, 40, 80 ...
+BACKOFF_MAX = 60 * 60
+
+
+def task_path(task):
+    if callable(task):
+        return f'{task.__module__}.{task.__qualname__}'
+    return task
+
+
+# 작업을 큐에 넣음
+# 트랜잭션 안에서 호출하면 트랜잭션이 커밋될 때 함께 보이게 됨
+# enqueue('post.tasks.index_post_tags', post.pk)
+def enqueue(task, *args, delay=0, max_attempts=5, **kwargs):
+    path = task_path(task)
+
+    # 테스트/개발용: 워커 없이 커밋 직후 바로 실행
+    if getattr(settings, 'JOB_QUEUE_EAGER', False):
+        transaction.on_commit(lambda: import_string(path)(*args, **kwargs))
+        return None
+
+    return Job.objects.create(
+        task=path,
+        args=list(args),
+        kwargs=kwargs,
+        max_attempts=max_attempts,
+        run_at=timezone.now() + timedelta(seconds=delay),
+    )
+
+
+def claim(worker, limit=10, timeout=VISIBILITY_TIMEOUT):
+    now = timezone.now()
+    runnable = Q(status=Job.STATUS_QUEUED, run_at__lte=now) | Q(status=Job.STATUS_RUNNING, locked_until__lt=now)
+
+    # 잠금이 만료됐지만 더 이상 재시도할 수 없는 작업은 실패 처리
+    Job.objects.filter(
+        status=Job.STATUS_RUNNING, locked_until__lt=now, attempts__gte=F('max_attempts')
+    ).update(status=Job.STATUS_FAILED, last_error='visibility timeout', locked_by='', locked_until=None)
+
+    ids = list(Job.objects.filter(runnable).order_by('run_at', 'id').values_list('pk', flat=True)[:limit])
+    if not ids:
+        return []
+
+    # 조건을 UPDATE 문에 다시 넣어서 다른 워커가 먼저 가져간 작업은 건너뜀
+    token = f'{worker}:{uuid.uuid4().hex}'
+    Job.objects.filter(runnable, pk__in=ids).update(
+        status=Job.STATUS_RUNNING,
+        locked_by=token,
+        locked_until=now + timedelta(seconds=timeout),
+        attempts=F('attempts') + 1,
+    )
+    return list(Job.objects.filter(locked_by=token).order_by('run_at', 'id'))
+
+
+def backoff(attempts):
+    # 지수 백오프 + 지터(여러 작업이 같은 시각에 몰리지 않도록)
+    seconds = min(BACKOFF_BASE * 2 ** (attempts - 1), BACKOFF_MAX)
+    return timedelta(seconds=seconds * random.uniform(0.5, 1.5))
+
+
+def run(job):
+    # 잠금을 잃었다면(타임아웃 후 다른 워커가 가져감) 결과를 기록하지 않음
+    mine = Job.objects.filter(pk=job.pk, locked_by=job.locked_by)
+
+    try:
+        import_string(job.task)(*job.args, **job.kwargs)
+    except Exception:
+        error = traceback.format_exc()
+        if job.attempts >= job.max_attempts:
+            mine.update(status=Job.STATUS_FAILED, last_error=error, locked_by='', locked_until=None)
+        else:
+            mine.update(
+                status=Job.STATUS_QUEUED,
+                run_at=timezone.now() + backoff(job.attempts),
+                last_error=error,
+                locked_by='',
+                locked_until=None,
+            )
+        return False
+
+    mine.update(status=Job.STATUS_DONE, locked_by='', locked_until=None)
+    return True
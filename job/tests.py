@@ -0,0 +1,321 @@
+import builtins
+import multiprocessing
+import os
+import smtplib
+import time
+from datetime import timedelta
+from io import StringIO
+from unittest import mock
+
+from django.core import mail
+from django.core.mail import send_mail
+from django.core.mail.backends.locmem import EmailBackend
+from django.test import TestCase, override_settings
+from django.utils import timezone
+
+from job import outbox, queue
+from job.management.commands.runworker import Command as RunWorkerCommand
+from job.models import Job, Outbox
+from utils.email import send_email
+
+CONNECT_DELAY = 0.02  # SMTP/TLS 연결에 걸리는 시간 흉내
+
+
+# 로컬 SMTP 대용: locmem 백엔드에 연결 횟수와 연결 지연을 추가
+class SlowConnectBackend(EmailBackend):
+    opened = 0
+
+    def open(self):
+        if getattr(self, 'connection', None) is None:
+            time.sleep(CONNECT_DELAY)
+            SlowConnectBackend.opened += 1
+            self.connection = True
+            return True
+        return False
+
+    def close(self):
+        self.connection = None
+
+    def send_messages(self, messages):
+        # send_mail() 처럼 연결 없이 호출되면 메일마다 새로 연결함
+        new_connection = self.open()
+        try:
+            for message in messages:
+                if 'fail@' in ','.join(message.to):
+                    raise ConnectionError('recipient refused')
+            return super().send_messages(messages)
+        finally:
+            if new_connection:
+                self.close()
+
+
+# 보낸 메일이 drop_after 통이 되면 메일 서버가 연결을 끊음. stay_down 이면 그 뒤로 다시 연결도 안 됨
+class DroppingBackend(SlowConnectBackend):
+    drop_after = None
+    stay_down = False
+    down = False
+
+    def open(self):
+        if DroppingBackend.down:
+            raise ConnectionRefusedError('server down')
+        return super().open()
+
+    def send_messages(self, messages):
+        if self.connection == 'closed by server' or len(mail.outbox) == DroppingBackend.drop_after:
+            DroppingBackend.drop_after = None
+            DroppingBackend.down = DroppingBackend.stay_down
+            self.connection = 'closed by server'
+            raise smtplib.SMTPServerDisconnected('Connection unexpectedly closed')
+        return super().send_messages(messages)
+
+
+@override_settings(EMAIL_BACKEND='job.tests.SlowConnectBackend')
+class OutboxTest(TestCase):
+
+    def setUp(self):
+        SlowConnectBackend.opened = 0
+
+    def test_signup_only_writes_outbox(self):
+        started = time.monotonic()
+        response = self.client.post('/signup/', {
+            'email': 'new@example.com',
+            'nickname': 'new',
+            'password1': 'pystagram-pw-1234',
+            'password2': 'pystagram-pw-1234',
+        }, HTTP_HOST='testserver')
+        elapsed = time.monotonic() - started
+
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(SlowConnectBackend.opened, 0)  # 요청 안에서는 SMTP 연결을 열지 않음
+        self.assertEqual(len(mail.outbox), 0)
+        self.assertEqual(Outbox.objects.filter(to=['new@example.com']).count(), 1)
+        self.assertLess(elapsed, 1)
+
+    def test_deliver_reuses_one_connection(self):
+        count = 30
+        for i in range(count):
+            send_email('subject', 'message', f'user{i}@example.com')
+
+        started = time.monotonic()
+        sent, failed = outbox.deliver(limit=count)
+        batched = time.monotonic() - started
+
+        self.assertEqual((sent, failed), (count, 0))
+        self.assertEqual(SlowConnectBackend.opened, 1)
+        self.assertEqual(len(mail.outbox), count)
+        self.assertEqual(Outbox.objects.filter(status=Outbox.STATUS_SENT).count(), count)
+
+        # 기존 방식: send_mail() 마다 연결을 새로 맺음
+        SlowConnectBackend.opened = 0
+        started = time.monotonic()
+        for i in range(count):
+            send_mail('subject', 'message', 'from@example.com', [f'user{i}@example.com'])
+        one_by_one = time.monotonic() - started
+
+        self.assertEqual(SlowConnectBackend.opened, count)
+        self.assertLess(batched, one_by_one)
+
+    def test_failed_message_is_retried_later(self):
+        send_email('subject', 'message', 'fail@example.com')
+        send_email('subject', 'message', 'ok@example.com')
+
+        sent, failed = outbox.deliver()
+
+        self.assertEqual((sent, failed), (1, 1))
+        email = Outbox.objects.get(to=['fail@example.com'])
+        self.assertEqual(email.status, Outbox.STATUS_PENDING)
+        self.assertEqual(email.attempts, 1)
+        self.assertGreater(email.send_at, timezone.now())
+        self.assertIn('recipient refused', email.last_error)
+
+        # 재시도 시각 전에는 다시 보내지 않음
+        self.assertEqual(outbox.deliver(), (0, 0))
+
+    @override_settings(EMAIL_BACKEND='job.tests.DroppingBackend')
+    def test_reconnects_after_disconnect(self):
+        for i in range(5):
+            send_email('subject', 'message', f'user{i}@example.com')
+        DroppingBackend.drop_after, DroppingBackend.stay_down, DroppingBackend.down = 2, False, False
+
+        self.assertEqual(outbox.deliver(), (5, 0))
+        self.assertEqual(SlowConnectBackend.opened, 2)
+        self.assertEqual(len(mail.outbox), 5)
+        self.assertEqual(set(Outbox.objects.values_list('attempts', flat=True)), {1})
+
+    @override_settings(EMAIL_BACKEND='job.tests.DroppingBackend')
+    def test_stops_when_server_is_gone(self):
+        for i in range(5):
+            send_email('subject', 'message', f'user{i}@example.com')
+        DroppingBackend.drop_after, DroppingBackend.stay_down, DroppingBackend.down = 2, True, False
+
+        self.assertEqual(outbox.deliver(), (2, 0))
+
+        # 보내지 못한 메일은 시도 횟수를 쓰지 않고 바로 다시 보낼 수 있음
+        unsent = Outbox.objects.exclude(status=Outbox.STATUS_SENT)
+        self.assertEqual(unsent.count(), 3)
+        self.assertEqual(set(unsent.values_list('status', 'attempts', 'locked_by')), {(Outbox.STATUS_PENDING, 0, '')})
+
+        DroppingBackend.down = False
+        self.assertEqual(outbox.deliver(), (3, 0))
+
+    def test_gives_up_after_max_attempts(self):
+        email = send_email('subject', 'message', 'fail@example.com')
+        Outbox.objects.filter(pk=email.pk).update(attempts=outbox.MAX_ATTEMPTS - 1)
+
+        outbox.deliver()
+
+        email.refresh_from_db()
+        self.assertEqual(email.status, Outbox.STATUS_FAILED)
+
+    def test_rate_limit(self):
+        for i in range(5):
+            send_email('subject', 'message', f'user{i}@example.com')
+
+        started = time.monotonic()
+        outbox.deliver(rate=50)
+
+        self.assertGreaterEqual(time.monotonic() - started, 4 / 50)
+
+
+def succeed_task():
+    pass
+
+
+def fail_task():
+    raise ValueError('task failed')
+
+
+@override_settings(JOB_QUEUE_EAGER=False)
+class QueueTest(TestCase):
+
+    def test_claim_takes_each_job_once(self):
+        jobs = [queue.enqueue(succeed_task) for _ in range(3)]
+
+        first = queue.claim('a', limit=2)
+        second = queue.claim('b', limit=10)
+
+        self.assertEqual([job.pk for job in first + second], [job.pk for job in jobs])
+        self.assertEqual({job.locked_by.split(':')[0] for job in first}, {'a'})
+        self.assertEqual(queue.claim('c'), [])
+
+    def test_claim_race(self):
+        # 두 워커가 같은 작업 id 를 읽은 경우: 먼저 UPDATE 한 워커만 가져감
+        job = queue.enqueue(succeed_task)
+        self.assertEqual(len(queue.claim('a')), 1)
+
+        stale_ids = iter([[job.pk]])  # 처음 읽는 작업 id 목록만 바꿔치기
+
+        def read(rows):
+            return next(stale_ids, None) or builtins.list(rows)
+
+        with mock.patch('job.queue.list', side_effect=read, create=True):
+            self.assertEqual(queue.claim('b'), [])
+
+        job.refresh_from_db()
+        self.assertTrue(job.locked_by.startswith('a:'))
+        self.assertEqual(job.attempts, 1)
+
+    def test_expired_lease_is_reclaimed(self):
+        queue.enqueue(succeed_task)
+        [lost] = queue.claim('a', timeout=60)
+        self.assertEqual(queue.claim('b'), [])  # 잠금 시간 동안은 다른 워커에게 보이지 않음
+
+        Job.objects.filter(pk=lost.pk).update(locked_until=timezone.now() - timedelta(seconds=1))
+        [job] = queue.claim('b')
+
+        self.assertEqual(job.pk, lost.pk)
+        self.assertEqual(job.attempts, 2)
+        # 잠금을 잃은 워커의 결과는 기록하지 않음
+        queue.run(lost)
+        job.refresh_from_db()
+        self.assertEqual(job.status, Job.STATUS_RUNNING)
+        self.assertTrue(job.locked_by.startswith('b:'))
+
+        self.assertTrue(queue.run(job))
+        job.refresh_from_db()
+        self.assertEqual(job.status, Job.STATUS_DONE)
+
+    def test_expired_lease_without_attempts_left_fails(self):
+        queue.enqueue(succeed_task, max_attempts=1)
+        [job] = queue.claim('a')
+        Job.objects.filter(pk=job.pk).update(locked_until=timezone.now() - timedelta(seconds=1))
+
+        self.assertEqual(queue.claim('b'), [])
+        job.refresh_from_db()
+        self.assertEqual(job.status, Job.STATUS_FAILED)
+        self.assertEqual(job.last_error, 'visibility timeout')
+
+    def test_retry_with_backoff(self):
+        queue.enqueue(fail_task)
+        [job] = queue.claim('a')
+
+        self.assertFalse(queue.run(job))
+
+        job.refresh_from_db()
+        self.assertEqual(job.status, Job.STATUS_QUEUED)
+        self.assertEqual(job.locked_by, '')
+        self.assertIn('task failed', job.last_error)
+        self.assertGreater(job.run_at, timezone.now() + timedelta(seconds=queue.BACKOFF_BASE * 0.5 - 1))
+        self.assertEqual(queue.claim('a'), [])  # 재시도 시각 전에는 가져가지 않음
+
+    def test_backoff(self):
+        for attempts in range(1, 20):
+            seconds = min(queue.BACKOFF_BASE * 2 ** (attempts - 1), queue.BACKOFF_MAX)
+            delay = queue.backoff(attempts).total_seconds()
+            self.assertGreaterEqual(delay, seconds * 0.5)
+            self.assertLessEqual(delay, seconds * 1.5)
+
+    def test_gives_up_after_max_attempts(self):
+        queue.enqueue(fail_task, max_attempts=2)
+        for _ in range(2):
+            Job.objects.update(run_at=timezone.now())
+            [job] = queue.claim('a')
+            queue.run(job)
+
+        job.refresh_from_db()
+        self.assertEqual(job.status, Job.STATUS_FAILED)
+        self.assertEqual(job.attempts, 2)
+        self.assertEqual(queue.claim('a'), [])
+
+
+# 두 번은 비정상 종료하고 세 번째에 정상 종료하는 자식 프로세스
+def crash_twice(starts):
+    with starts.get_lock():
+        starts.value += 1
+        count = starts.value
+    if count <= 2:
+        os._exit(1)
+
+
+class RunWorkerTest(TestCase):
+
+    def test_restarts_crashed_workers(self):
+        context = multiprocessing.get_context('fork')
+        stop = context.Event()
+        starts = context.Value('i', 0)
+
+        def start(number):
+            process = context.Process(target=crash_twice, args=(starts,), daemon=True)
+            process.start()
+            return process
+
+        command = RunWorkerCommand(stdout=StringIO())
+        command.supervise(start, [start(0)], stop, interval=0.01)
+
+        self.assertEqual(starts.value, 3)
+        self.assertEqual(command.stdout.getvalue().count('restarting'), 2)
+
+    def test_does_not_restart_after_stop(self):
+        context = multiprocessing.get_context('fork')
+        stop = context.Event()
+        stop.set()
+        starts = context.Value('i', 0)
+
+        def start(number):
+            process = context.Process(target=crash_twice, args=(starts,), daemon=True)
+            process.start()
+            return process
+
+        RunWorkerCommand(stdout=StringIO()).supervise(start, [start(0)], stop, interval=0.01)
+
+        self.assertEqual(starts.value, 1)
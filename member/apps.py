@@ -4,3 +4,7 @@ from django.apps import AppConfig
 class MemberConfig(AppConfig):
     default_auto_field = 'django.db.models.BigAutoField'
     name = 'member'
+
+    def ready(self):
+        # signal 등록
+        from member import search, suggestions  # noqa
@@ -0,0 +1,160 @@
+import asyncio
+import json
+import os
+import subprocess
+import sys
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import redirect_stdout
+from io import StringIO
+
+from django.conf import settings
+from django.core import signing
+from django.core.management.base import BaseCommand, CommandError
+from django.test import AsyncClient, Client
+from django.test.utils import override_settings
+from django.urls import reverse
+
+from member import oauth_views
+
+BENCH_EMAIL = 'bench-oauth@example.invalid'  # 가입되지 않은 이메일 -> 닉네임 입력 화면으로 redirect
+
+
+# 로컬 OAuth 서버 대역: 모든 응답을 delay 초 늦게 돌려줌 (느린 외부 API 흉내)
+# 대역 서버가 병목이 되지 않도록 별도 스레드의 이벤트 루프에서 실행하고 keep-alive 를 지원함
+class ProviderServer:
+
+    def __init__(self, delay):
+        self.delay = delay
+        self.port = None
+        self.ready = threading.Event()
+
+    def start(self):
+        threading.Thread(target=asyncio.run, args=(self.serve(),), daemon=True).start()
+        self.ready.wait()
+        return f'http://127.0.0.1:{self.port}'
+
+    async def serve(self):
+        server = await asyncio.start_server(self.handle, '127.0.0.1', 0, backlog=1024)
+        self.port = server.sockets[0].getsockname()[1]
+        self.ready.set()
+        await server.serve_forever()
+
+    async def handle(self, reader, writer):
+        try:
+            while request_line := await reader.readline():
+                while await reader.readline() not in (b'\r\n', b''):  # 헤더는 읽고 버림
+                    pass
+
+                await asyncio.sleep(self.delay)
+                if request_line.split()[1].startswith(b'/login/oauth/access_token'):
+                    body, content_type = b'access_token=bench-token&token_type=bearer', b'application/x-www-form-urlencoded'
+                else:
+                    body, content_type = json.dumps({'login': 'bench', 'email': BENCH_EMAIL}).encode(), b'application/json'
+
+                writer.write(
+                    b'HTTP/1.1 200 OK\r\nContent-Type: %s\r\nContent-Length: %d\r\n\r\n%s'
+                    % (content_type, len(body), body)
+                )
+                await writer.drain()
+        except ConnectionError:
+            pass
+        writer.close()
+
+
+class Command(BaseCommand):
+    help = ('로컬 OAuth 서버 대역(응답 지연)을 띄우고 깃허브 로그인 콜백을 WSGI(스레드 + requests)와 '
+            'ASGI(async 뷰 + httpx 연결 풀)로 동시에 요청해서 처리량과 응답 시간을 비교합니다.')
+
+    def add_arguments(self, parser):
+        parser.add_argument('-n', '--requests', type=int, default=400, help='경우마다 보낼 요청 수')
+        parser.add_argument('-c', '--concurrency', type=int, default=200, help='동시에 기다리는 클라이언트 수')
+        parser.add_argument('-t', '--threads', type=int, default=16, help='WSGI 워커 스레드 수 (gunicorn --threads)')
+        parser.add_argument('--delay', type=float, default=0.2, help='OAuth 서버 응답 지연(초)')
+        parser.add_argument('--worker', choices=['wsgi', 'asgi'], help='(내부용) 한 가지 방식만 실행')
+        parser.add_argument('--provider', help='(내부용) OAuth 서버 대역 주소')
+
+    def handle(self, *args, **options):
+        if options['worker']:
+            return self.run_worker(options)
+
+        provider = ProviderServer(options['delay']).start()
+
+        self.stdout.write(
+            f'{options["requests"]} requests, {options["concurrency"]} concurrent clients, '
+            f'provider delay {options["delay"]}s x 2 calls'
+        )
+        for mode, name in [('wsgi', f'WSGI ({options["threads"]} threads)'), ('asgi', 'ASGI (async views)')]:
+            result = self.spawn(mode, provider, options)
+            self.stdout.write(
+                f'  {name:<22} {result["rps"]:8.1f} req/s  p50 {result["p50"] * 1000:7.0f}ms  '
+                f'p95 {result["p95"] * 1000:7.0f}ms  errors {result["errors"]}'
+            )
+
+    def spawn(self, mode, provider, options):
+        # ASYNC_VIEWS 에 따라 URL 설정이 달라지므로 방식마다 프로세스를 따로 띄움
+        env = {**os.environ, 'ASYNC_VIEWS': '1' if mode == 'asgi' else '0'}
+        command = [
+            sys.executable, '-m', 'django', 'bench_oauth', '--worker', mode, '--provider', provider,
+            '-n', str(options['requests']), '-c', str(options['concurrency']), '-t', str(options['threads']),
+        ]
+        process = subprocess.run(command, cwd=settings.BASE_DIR, env=env, capture_output=True, text=True)
+        if process.returncode:
+            raise CommandError(process.stderr)
+        return json.loads(process.stdout.strip().splitlines()[-1])
+
+    def run_worker(self, options):
+        # 콜백이 부르는 외부 API 주소를 로컬 대역으로 바꿈
+        oauth_views.GITHUB_TOKEN_URL = f'{options["provider"]}/login/oauth/access_token'
+        oauth_views.GITHUB_PROFILE_URL = f'{options["provider"]}/user'
+
+        url = reverse('oauth:github_callback')
+        data = {'code': 'bench', 'state': signing.dumps(oauth_views.GITHUB_STATE)}
+
+        # 기존 콜백은 토큰/프로필을 print 하므로 결과 출력과 섞이지 않도록 버림
+        # 테스트 클라이언트의 Host 헤더는 항상 testserver
+        with redirect_stdout(StringIO()), override_settings(ALLOWED_HOSTS=['testserver']):
+            started = time.perf_counter()
+            load = self.load_wsgi if options['worker'] == 'wsgi' else self.load_asgi
+            results = asyncio.run(load(url, data, options))
+            elapsed = time.perf_counter() - started
+
+        latencies = sorted(latency for latency, _ in results)
+        self.stdout.write(json.dumps({
+            'rps': len(results) / elapsed,
+            'p50': latencies[len(latencies) // 2],
+            'p95': latencies[int(len(latencies) * 0.95)],
+            'errors': sum(status != 302 for _, status in results),
+        }))
+
+    async def load_wsgi(self, url, data, options):
+        # 클라이언트는 ASGI 와 같은 방식으로 보내고, 서버 쪽은 워커 스레드 수만큼만 동시에 처리
+        # 스레드가 비기를 기다린 시간도 응답 시간에 포함됨
+        local = threading.local()
+        workers = ThreadPoolExecutor(options['threads'])
+
+        def handle():
+            if not hasattr(local, 'client'):
+                local.client = Client()
+            return local.client.get(url, data)
+
+        loop = asyncio.get_running_loop()
+        with workers:
+            return await self.load(lambda: loop.run_in_executor(workers, handle), options)
+
+    async def load_asgi(self, url, data, options):
+        client = AsyncClient()
+        return await self.load(lambda: client.get(url, data), options)
+
+    async def load(self, send, options):
+        # concurrency 명의 클라이언트가 응답을 받는 대로 다음 요청을 보냄
+        semaphore = asyncio.Semaphore(options['concurrency'])
+
+        async def call():
+            async with semaphore:
+                started = time.perf_counter()
+                response = await send()
+                return time.perf_counter() - started, response.status_code
+
+        return await asyncio.gather(*(call() for _ in range(options['requests'])))
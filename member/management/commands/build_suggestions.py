@@ -0,0 +1,33 @@
+from django.contrib.auth import get_user_model
+from django.core.management.base import BaseCommand
+
+from member.suggestions import BATCH_SIZE, compute
+
+User = get_user_model()
+
+
+class Command(BaseCommand):
+    help = '팔로우 관계로 유저별 추천 계정(친구의 친구)을 계산해서 저장합니다.'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--batch', type=int, default=BATCH_SIZE, help='한 번에 계산할 유저 수')
+        parser.add_argument('--user', type=int, help='특정 유저(pk)의 추천만 계산')
+
+    def handle(self, *args, **options):
+        users = User.objects.filter(is_active=True)
+        if options['user']:
+            users = users.filter(pk=options['user'])
+
+        count = 0
+        batch = []
+        for user_id in users.order_by('pk').values_list('pk', flat=True).iterator():
+            batch.append(user_id)
+            if len(batch) == options['batch']:
+                compute(batch)
+                count += len(batch)
+                batch = []
+        if batch:
+            compute(batch)
+            count += len(batch)
+
+        self.stdout.write(f'{count} users done')
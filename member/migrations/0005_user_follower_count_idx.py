@@ -0,0 +1,17 @@
+# Generated by Django 5.1.15 on 2026-10-18 08:42
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('member', '0004_user_counters'),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='user',
+            index=models.Index(fields=['follower_count'], name='user_follower_count_idx'),
+        ),
+    ]
@@ -0,0 +1,51 @@
+# Generated by Django 5.1.15 on 2026-10-18 08:50
+
+import unicodedata
+
+import django.db.models.deletion
+from django.conf import settings
+from django.db import migrations, models
+
+
+def fill_nickname_search(apps, schema_editor):
+    # 기존 유저의 검색용 닉네임과 trigram 채우기
+    User = apps.get_model('member', 'User')
+    NicknameTrigram = apps.get_model('member', 'NicknameTrigram')
+
+    for user in User.objects.all().iterator():
+        nickname_lower = unicodedata.normalize('NFKC', user.nickname or '').casefold()[:40]
+        User.objects.filter(pk=user.pk).update(nickname_lower=nickname_lower)
+        NicknameTrigram.objects.bulk_create(
+            [
+                NicknameTrigram(user_id=user.pk, gram=gram)
+                for gram in {nickname_lower[i:i + 3] for i in range(len(nickname_lower) - 2)}
+            ],
+            ignore_conflicts=True,
+        )
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('member', '0005_user_follower_count_idx'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='user',
+            name='nickname_lower',
+            field=models.CharField(db_index=True, default='', editable=False, max_length=40, verbose_name='검색용 닉네임'),
+        ),
+        migrations.CreateModel(
+            name='NicknameTrigram',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('gram', models.CharField(max_length=3, verbose_name='조각')),
+                ('user', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='nickname_trigrams', to=settings.AUTH_USER_MODEL)),
+            ],
+            options={
+                'unique_together': {('gram', 'user')},
+            },
+        ),
+        migrations.RunPython(fill_nickname_search, migrations.RunPython.noop),
+    ]
@@ -0,0 +1,21 @@
+# Generated by Django 5.1.15 on 2026-10-18 08:56
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('member', '0006_nickname_search'),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='userfollowing',
+            index=models.Index(fields=['to_user', '-created_at', '-id'], name='following_to_created_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='userfollowing',
+            index=models.Index(fields=['from_user', '-created_at', '-id'], name='following_from_created_idx'),
+        ),
+    ]
@@ -1,9 +1,15 @@
+import unicodedata
+
 from django.contrib.auth.base_user import AbstractBaseUser, BaseUserManager
 from django.db import models
 
 from utils.models import TimestampModel
 
 
+# 닉네임 검색용 정규화 (대소문자, 전각/반각 구분 없이 검색)
+def normalize_nickname(nickname):
+    return unicodedata.normalize('NFKC', nickname or '').casefold()[:40]
+
 # 사용자 지정 메니져
 class UserManager(BaseUserManager):
     def create_user(self, email, password):
@@ -48,6 +54,8 @@ class User(AbstractBaseUser):  # 기본 기능은 상속받아서 사용
     # is_staff = models.BooleanField(default = False)  # is_staff 기능
     # is_superuser = models.BooleanField(default = False)  # is_superuser 기능
     nickname = models.CharField('nickname', max_length=20, unique=True)
+    # 검색용 소문자(정규화) 닉네임. save() 에서 자동으로 채움
+    nickname_lower = models.CharField('검색용 닉네임', max_length=40, db_index=True, editable=False, default='')
     # 나를 팔로우 하는 사람이 팔로워
     # 내가 팔로우 하는 사람이 팔로잉
     # User N:N User
@@ -57,6 +65,10 @@ class User(AbstractBaseUser):  # 기본 기능은 상속받아서 사용
         'self', symmetrical=False, related_name='followers',
         through='UserFollowing', through_fields=('from_user', 'to_user')
     )  # 'self' User가 User를 받을 수 없어서 self사용
+    # 카운터 컬럼. 프로필에서 .count로 모든 행을 세지 않도록 미리 저장해둠
+    post_count = models.PositiveIntegerField('게시물 수', default=0)
+    follower_count = models.PositiveIntegerField('팔로워 수', default=0)
+    following_count = models.PositiveIntegerField('팔로잉 수', default=0)
 
     # 사용자 지정 메니져
     # User.objects.all()   <- objects가 메니져
@@ -68,6 +80,17 @@ class User(AbstractBaseUser):  # 기본 기능은 상속받아서 사용
     class Meta:
         verbose_name = '유저'
         verbose_name_plural = f'{verbose_name} 목록'
+        indexes = [
+            # 타임라인에서 팔로워가 많은 계정(셀럽)을 찾을 때 사용
+            models.Index(fields=['follower_count'], name='user_follower_count_idx'),
+        ]
+
+    def save(self, *args, **kwargs):
+        self.nickname_lower = normalize_nickname(self.nickname)
+        update_fields = kwargs.get('update_fields')
+        if update_fields is not None and 'nickname' in update_fields:
+            kwargs['update_fields'] = {*update_fields, 'nickname_lower'}
+        super().save(*args, **kwargs)
 
     def get_full_name(self): # 사용자의 전체 이름(Full name)을 반환. 성과 이름을 합침
         # return f"{self.first_name} {self.last_name}"
@@ -116,3 +139,33 @@ class UserFollowing(TimestampModel):
         # to_user 1, from_user 2
         # to_user 1, from_user 3
         # to_user 1, from_user 2 => 오류'
+        indexes = [
+            # 프로필 모달의 팔로워/팔로잉 목록 (created_at, id) 순서로 조회
+            models.Index(fields=['to_user', '-created_at', '-id'], name='following_to_created_idx'),
+            models.Index(fields=['from_user', '-created_at', '-id'], name='following_from_created_idx'),
+        ]
+
+# 닉네임 3글자 조각(trigram)
+# 닉네임 중간에 들어간 검색어(infix)를 전체 검색 없이 찾기 위해 사용
+# ex) 'pystagram' -> pys, yst, sta, tag, agr, gra, ram
+class NicknameTrigram(models.Model):
+    user = models.ForeignKey(User, on_delete=models.CASCADE, related_name='nickname_trigrams')
+    gram = models.CharField('조각', max_length=3)
+
+    class Meta:
+        unique_together = ('gram', 'user')
+
+
+# 추천 계정 (친구의 친구)
+# 내가 팔로우하는 사람들이 팔로우하는 계정을 겹치는 수(mutual_count) 순으로 상위 몇 개만 저장해둠
+# 계산은 워커/명령어에서 미리 하고(member/suggestions.py), 화면에서는 이 테이블만 읽음
+class Suggestion(models.Model):
+    user = models.ForeignKey(User, on_delete=models.CASCADE, related_name='suggestions')
+    suggested = models.ForeignKey(User, on_delete=models.CASCADE, related_name='+')
+    mutual_count = models.PositiveIntegerField('함께 아는 친구 수')
+
+    class Meta:
+        unique_together = ('user', 'suggested')
+        indexes = [
+            models.Index(fields=['user', '-mutual_count'], name='suggestion_user_mutual_idx'),
+        ]
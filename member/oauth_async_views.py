@@ -0,0 +1,108 @@
+from urllib.parse import parse_qs, urlencode
+
+from django.conf import settings
+from django.contrib.auth import alogin, get_user_model
+from django.core import signing
+from django.http import Http404
+from django.shortcuts import redirect
+from django.urls import reverse
+
+from member import oauth_views, providers
+
+User = get_user_model()
+
+# ASGI 로 실행할 때 사용하는 async 버전의 OAuth 콜백 (settings.ASYNC_VIEWS)
+# 네이버/깃허브 API 응답을 기다리는 동안 워커 스레드를 붙잡지 않으므로 느린 요청이 많아도 한 워커에서 처리 가능
+# 외부 API 호출은 기존 콜백과 같은 timeout/재시도 정책을 따름 (member.providers.aget)
+# 로그인 주소(RedirectView)와 닉네임 입력 화면은 외부 요청을 기다리지 않거나 드물어서 기존 뷰를 그대로 사용
+
+
+async def naver_callback(request):
+    code = request.GET.get('code')
+    state = request.GET.get('state')
+
+    if oauth_views.NAVER_STATE != signing.loads(state):
+        raise Http404
+
+    access_token = await get_naver_access_token(code, state)
+    profile = await get_naver_profile(access_token)
+    return await login_or_signup(request, profile.get('email'), 'naver')
+
+
+async def github_callback(request):
+    code = request.GET.get('code')
+    state = request.GET.get('state')
+
+    if oauth_views.GITHUB_STATE != signing.loads(state):
+        raise Http404
+
+    access_token = await get_github_access_token(code, state)
+    if not access_token:
+        raise Http404
+
+    profile = await get_github_profile(access_token)
+    return await login_or_signup(request, profile.get('email'), 'github')
+
+
+async def login_or_signup(request, email, oauth):
+    user = await User.objects.filter(email=email).afirst()
+
+    # 유저가 있다면 로그인 (활성화 되지 않았으면 활성화)
+    if user:
+        if not user.is_active:
+            user.is_active = True
+            await user.asave()
+
+        await alogin(request, user)
+        return redirect('main')
+
+    # 유저가 없으면 닉네임을 입력받아서 생성 (프로필은 서명해서 넘김. member.providers)
+    return redirect(reverse('oauth:nickname') + '?' + urlencode({'profile': providers.dump_profile(oauth, email)}))
+
+
+async def get_naver_access_token(code, state):
+    params = {
+        'grant_type': 'authorization_code',
+        'client_id': settings.NAVER_CLIENT_ID,
+        'client_secret': settings.NAVER_CLIENT_SECRET,
+        'code': code,
+        'state': state
+    }
+    response = await providers.aget(oauth_views.NAVER_TOKEN_URL, params=params, retry=False)  # 인가 코드는 한 번만 사용 가능
+    return response.json().get('access_token')
+
+
+async def get_naver_profile(access_token):
+    headers = {'Authorization': f'Bearer {access_token}'}
+    response = await providers.aget(oauth_views.NAVER_PROFILE_URL, headers=headers)
+
+    if response.status_code != 200:
+        raise Http404
+
+    return response.json().get('response')
+
+
+async def get_github_access_token(code, state):
+    params = {
+        'client_id': settings.GITHUB_CLIENT_ID,
+        'client_secret': settings.GITHUB_CLIENT_SECRET,
+        'code': code,
+        'state': state
+    }
+    response = await providers.aget(oauth_views.GITHUB_TOKEN_URL, params=params, retry=False)  # 인가 코드는 한 번만 사용 가능
+
+    # access_token=...&scope=...&token_type=bearer  형식의 문자열
+    return parse_qs(response.text).get('access_token', [None])[0]
+
+
+async def get_github_profile(access_token):
+    headers = {'Authorization': f'Bearer {access_token}'}
+    response = await providers.aget(oauth_views.GITHUB_PROFILE_URL, headers=headers)
+
+    if response.status_code != 200:
+        raise Http404
+
+    result = response.json()
+    if not result.get('email'):
+        result['email'] = f'{result["login"]}@id.github.com'
+    return result
@@ -1,15 +1,21 @@
+from django.conf import settings
 from django.urls import path
 from . import oauth_views
 
+# ASGI 로 실행할 때는 외부 API 를 기다리는 콜백만 async 뷰 사용 (settings.ASYNC_VIEWS)
+callback_views = oauth_views
+if settings.ASYNC_VIEWS:
+    from . import oauth_async_views as callback_views
+
 app_name = 'oauth'
 urlpatterns = [
     # naver
     path('naver/login/', oauth_views.NaverLoginRedirectView.as_view(), name='naver_login'),
-    path('naver/callback/', oauth_views.naver_callback, name='naver_callback'),
+    path('naver/callback/', callback_views.naver_callback, name='naver_callback'),
 
     # github
     path('github/login/', oauth_views.GithubLoginRedirectView.as_view(), name='github_login'),
-    path('github/callback/', oauth_views.github_callback, name='github_callback'),
+    path('github/callback/', callback_views.github_callback, name='github_callback'),
 
     path('nickname/', oauth_views.oauth_nickname, name='nickname'),
 
@@ -1,6 +1,5 @@
 from urllib.parse import urlencode, parse_qs
 
-import requests
 from django.conf import settings
 from django.contrib.auth import login, get_user_model
 from django.core import signing
@@ -9,6 +8,7 @@ from django.shortcuts import redirect, render
 from django.urls import reverse
 from django.views.generic import RedirectView
 
+from member import providers
 from member.forms import NicknameForm
 
 User = get_user_model()
@@ -80,7 +80,8 @@ def naver_callback(request):
         return redirect('main')
 
     # 유저가 없으면 생성
-    return redirect(reverse('oauth:nickname')+f'?access_token={access_token}&oauth=naver')
+    # 가져온 프로필을 서명해서 닉네임 입력 단계로 넘김 (프로필을 다시 조회하지 않음)
+    return redirect(reverse('oauth:nickname') + '?' + urlencode({'profile': providers.dump_profile('naver', email)}))
 
 # 깃허브 로그인 인증 요청
 class GithubLoginRedirectView(RedirectView):
@@ -135,27 +136,21 @@ def github_callback(request):
         return redirect('main')
 
     # 유저가 없으면 생성
-    return redirect(reverse('oauth:nickname')+f'?access_token={access_token}&oauth=github')
+    return redirect(reverse('oauth:nickname') + '?' + urlencode({'profile': providers.dump_profile('github', email)}))
 
 
 def oauth_nickname(request):
-    access_token = request.GET.get('access_token')
-    oauth = request.GET.get('oauth')
+    # 콜백에서 서명해서 넘겨준 프로필 (member.providers)
+    profile = providers.load_profile(request.GET.get('profile'))
 
-    if not access_token or oauth not in ['naver', 'github']:
+    if not profile or profile['oauth'] not in ['naver', 'github']:
         return redirect('login')
 
     form = NicknameForm(request.POST or None)
 
     if form.is_valid():
         user = form.save(commit=False)
-
-        if oauth == 'naver':
-            profile = get_naver_profile(access_token)
-        else:
-            profile = get_github_profile(access_token)
-
-        email = profile.get('email')
+        email = profile['email']
 
         # 이메일이 존재하면. 이미 가입했으면. 오류
         if User.objects.filter(email=email).exists():
@@ -190,7 +185,7 @@ def get_naver_access_token(code, state):
 
     # 접근 토큰 발급 요청
     # 요청 후 각 토큰을 발급 받음 refresh_token , access_token
-    response = requests.get(NAVER_TOKEN_URL, params=params)
+    response = providers.get(NAVER_TOKEN_URL, params=params, retry=False)  # 인가 코드는 한 번만 사용 가능
     result = response.json()
     return result.get('access_token')
 
@@ -203,7 +198,7 @@ def get_naver_profile(access_token):
     }
 
     # 네이버 회원 프로필 조회 요청
-    response = requests.get(NAVER_PROFILE_URL, headers=headers)
+    response = providers.get(NAVER_PROFILE_URL, headers=headers)
 
     if response.status_code != 200:
         raise Http404
@@ -227,7 +222,7 @@ def get_github_access_token(code, state):
 
     # 접근 토큰 발급 요청
     # 요청 후 각 토큰을 발급 받음 refresh_token , access_token
-    response = requests.get(GITHUB_TOKEN_URL, params=params)
+    response = providers.get(GITHUB_TOKEN_URL, params=params, retry=False)  # 인가 코드는 한 번만 사용 가능
     # print(response)
     # print(response.content)
     # return ''
@@ -237,7 +232,7 @@ def get_github_access_token(code, state):
     # 2. 문자열을 딕셔너리로 변환
     response_dict = parse_qs(response_str)  # parse_qs() 문자열을 → 딕셔너리처럼 파싱해주는 함수
     # 3. access_token 값을 리스트에서 꺼내기
-    access_token = response_dict.get('access_token', [])[0]
+    access_token = response_dict.get('access_token', [None])[0]  # 발급 실패 시 None
     print(response_dict)
 
     # 요즘은 Accept: application / json 헤더만 넣으면 JSON 형식으로 응답함
@@ -255,7 +250,7 @@ def get_github_profile(access_token):
     }
 
     # 네이버 회원 프로필 조회 요청
-    response = requests.get(GITHUB_PROFILE_URL, headers=headers)
+    response = providers.get(GITHUB_PROFILE_URL, headers=headers)
 
     if response.status_code != 200:
         raise Http404
@@ -0,0 +1,105 @@
+import asyncio
+import random
+import time
+import weakref
+
+import httpx
+import requests
+from django.core import signing
+from requests.adapters import HTTPAdapter
+
+# 네이버/깃허브 API 호출용 HTTP 클라이언트
+# - 프로세스 전체에서 하나의 Session 을 사용해서 keep-alive 연결을 재사용 (로그인마다 TCP/TLS 연결을 새로 맺지 않음)
+# - 응답이 없는 외부 서버 때문에 워커가 계속 묶여 있지 않도록 timeout
+# - 연결 실패나 일시적인 오류(429, 5xx)는 지터를 넣은 지수 백오프로 몇 번 더 시도
+#   단, 토큰 발급(인가 코드 교환)은 서버가 이미 처리했을 수 있고 인가 코드는 한 번만 쓸 수 있으므로 retry=False 로 한 번만 보냄
+# async 뷰(member.oauth_async_views)는 같은 정책을 httpx 로 적용한 aget() 을 사용
+
+TIMEOUT = (3, 10)  # (연결, 응답) 초
+MAX_RETRIES = 2
+BACKOFF = 0.2  # n 번째 재시도 전에 0 ~ BACKOFF * 2^n 초 사이의 임의 시간만큼 기다림 (동시에 실패한 요청이 한꺼번에 몰리지 않도록)
+RETRY_STATUSES = {429, 500, 502, 503, 504}
+POOL_SIZE = 20  # 호스트당 유지할 연결 수 (워커 스레드 수 이상)
+# async 워커 하나가 동시에 기다리는 외부 요청 수만큼 연결을 열고 유지함
+ASYNC_LIMITS = httpx.Limits(max_connections=100, max_keepalive_connections=100)
+
+# 콜백에서 가져온 프로필을 닉네임 입력 단계로 넘길 때 사용 (access_token 을 URL 에 넣고 프로필을 다시 조회하지 않음)
+PROFILE_SALT = 'member.providers.profile'
+PROFILE_MAX_AGE = 60 * 10
+
+
+def create_session():
+    session = requests.Session()
+    adapter = HTTPAdapter(pool_maxsize=POOL_SIZE)
+    session.mount('https://', adapter)
+    session.mount('http://', adapter)
+    return session
+
+
+session = create_session()
+
+
+def get(url, retry=True, **kwargs):
+    kwargs.setdefault('timeout', TIMEOUT)
+    retries = MAX_RETRIES if retry else 0
+
+    for attempt in range(retries + 1):
+        try:
+            response = session.get(url, **kwargs)
+        except requests.ConnectionError:
+            # 연결 자체가 안 된 경우만 다시 시도. 응답 대기 중 timeout 은 서버가 이미 처리했을 수 있어서
+            # (인가 코드는 한 번만 사용 가능) 바로 실패시킴
+            if attempt == retries:
+                raise
+        else:
+            if response.status_code not in RETRY_STATUSES or attempt == retries:
+                return response
+
+        time.sleep(random.uniform(0, BACKOFF * 2 ** attempt))
+
+
+# 연결 풀은 이벤트 루프에 묶이므로 루프마다 클라이언트를 하나 만들어서 모든 요청이 keep-alive 연결을 함께 사용
+# (uvicorn 워커는 루프가 하나. 요청마다 TCP/TLS 연결을 새로 맺지 않음)
+_async_clients = weakref.WeakKeyDictionary()
+
+
+def get_async_client():
+    loop = asyncio.get_running_loop()
+    client = _async_clients.get(loop)
+    if client is None:
+        client = _async_clients[loop] = httpx.AsyncClient(limits=ASYNC_LIMITS)
+    return client
+
+
+async def aget(url, retry=True, **kwargs):
+    # get() 의 async 버전
+    connect_timeout, read_timeout = TIMEOUT
+    kwargs.setdefault('timeout', httpx.Timeout(read_timeout, connect=connect_timeout))
+    retries = MAX_RETRIES if retry else 0
+
+    for attempt in range(retries + 1):
+        try:
+            response = await get_async_client().get(url, **kwargs)
+        except (httpx.ConnectError, httpx.ConnectTimeout):
+            # get() 과 같이 연결 자체가 안 된 경우만 다시 시도
+            if attempt == retries:
+                raise
+        else:
+            if response.status_code not in RETRY_STATUSES or attempt == retries:
+                return response
+
+        await asyncio.sleep(random.uniform(0, BACKOFF * 2 ** attempt))
+
+
+def dump_profile(oauth, email):
+    return signing.dumps({'oauth': oauth, 'email': email}, salt=PROFILE_SALT, compress=True)
+
+
+def load_profile(value):
+    # 잘못되었거나 오래된 값이면 None
+    if not value:
+        return None
+    try:
+        return signing.loads(value, salt=PROFILE_SALT, max_age=PROFILE_MAX_AGE)
+    except signing.BadSignature:
+        return None
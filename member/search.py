@@ -0,0 +1,131 @@
+import bisect
+import threading
+import time
+
+from django.contrib.auth import get_user_model
+from django.core.cache import cache
+from django.db.models import Count
+from django.db.models.signals import post_init, post_save, post_delete
+from django.dispatch import receiver
+
+from member.models import NicknameTrigram, normalize_nickname
+
+User = get_user_model()
+
+# 검색어의 끝을 나타내는 문자. 'abc' <= nickname < 'abc\U0010ffff' 이면 'abc'로 시작함
+# LIKE 'abc%' 대신 범위 조건을 사용해서 DB 종류와 관계없이 인덱스를 탐
+PREFIX_END = '\U0010ffff'
+
+
+def trigrams(text):
+    return {text[i:i + 3] for i in range(len(text) - 2)}
+
+
+def search_users(q, limit=30):
+    # 자동완성(NicknameIndex)과 같이 활성화된 유저만 찾음
+    q = normalize_nickname(q.strip())
+    if not q:
+        return []
+
+    # 1. 접두어 검색: nickname_lower 인덱스 범위 조회
+    users = list(
+        User.objects.filter(nickname_lower__gte=q, nickname_lower__lt=q + PREFIX_END, is_active=True)
+        .order_by('nickname_lower')[:limit]
+    )
+
+    # 2. 결과가 부족하면 trigram 으로 중간에 포함된 닉네임도 찾음
+    grams = trigrams(q)
+    if len(users) < limit and grams:
+        candidates = (
+            NicknameTrigram.objects.filter(gram__in=grams)
+            .values('user')
+            .annotate(matched=Count('gram'))
+            .filter(matched=len(grams))
+            .values('user')
+        )
+        users += list(
+            User.objects.filter(pk__in=candidates, nickname_lower__contains=q, is_active=True)
+            .exclude(pk__in=[user.pk for user in users])
+            .order_by('nickname_lower')[:limit - len(users)]
+        )
+
+    return users
+
+
+# 자동완성용 메모리 인덱스
+# 정렬된 닉네임 목록에서 bisect 로 접두어 위치를 찾기 때문에 DB 조회 없이 바로 응답함
+# 유저가 바뀌면 캐시의 버전을 올리고, 각 프로세스는 버전이 바뀌었거나 오래되면 다시 만듦
+class NicknameIndex:
+    version_key = 'member:nickname_index_version'
+    max_age = 60 * 5  # 캐시가 프로세스마다 따로인 경우(locmem)를 위해 일정 시간마다 다시 만듦
+
+    def __init__(self):
+        self.keys = []
+        self.nicknames = []
+        self.version = None
+        self.loaded_at = 0
+        self.lock = threading.Lock()
+
+    def refresh(self):
+        version = cache.get(self.version_key, 0)
+
+        with self.lock:
+            if version == self.version and time.monotonic() - self.loaded_at < self.max_age:
+                return
+
+            rows = User.objects.filter(is_active=True).order_by('nickname_lower').values_list('nickname_lower', 'nickname')
+            rows = list(rows)
+            self.keys = [key for key, _ in rows]
+            self.nicknames = [nickname for _, nickname in rows]
+            self.version = version
+            self.loaded_at = time.monotonic()
+
+    def complete(self, q, limit=10):
+        q = normalize_nickname(q.strip())
+        if not q:
+            return []
+
+        self.refresh()
+        start = bisect.bisect_left(self.keys, q)
+        end = bisect.bisect_left(self.keys, q + PREFIX_END, lo=start, hi=min(start + limit, len(self.keys)))
+        return self.nicknames[start:end]
+
+    @classmethod
+    def invalidate(cls):
+        try:
+            cache.incr(cls.version_key)
+        except ValueError:
+            cache.set(cls.version_key, 1, None)
+
+
+nickname_index = NicknameIndex()
+
+
+@receiver(post_init, sender=User)
+def user_post_init(sender, instance, **kwargs):
+    # 닉네임이 바뀌었는지 확인하기 위해 불러올 때의 닉네임을 기억해둠
+    instance._loaded_nickname = instance.__dict__.get('nickname')
+    instance._loaded_is_active = instance.__dict__.get('is_active')
+
+
+@receiver(post_save, sender=User)
+def user_post_save(sender, instance, created, **kwargs):
+    nickname_changed = created or instance.nickname != instance._loaded_nickname
+    if nickname_changed:
+        # trigram 다시 만들기
+        NicknameTrigram.objects.filter(user=instance).delete()
+        NicknameTrigram.objects.bulk_create(
+            [NicknameTrigram(user=instance, gram=gram) for gram in trigrams(instance.nickname_lower)],
+            ignore_conflicts=True,
+        )
+
+    if nickname_changed or instance.is_active != instance._loaded_is_active:
+        NicknameIndex.invalidate()
+
+    instance._loaded_nickname = instance.nickname
+    instance._loaded_is_active = instance.is_active
+
+
+@receiver(post_delete, sender=User)
+def user_post_delete(sender, instance, **kwargs):
+    NicknameIndex.invalidate()
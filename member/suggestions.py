@@ -0,0 +1,84 @@
+from django.contrib.auth import get_user_model
+from django.db import transaction
+from django.db.models import Count, F
+from django.db.models.signals import post_save, post_delete
+from django.dispatch import receiver
+
+from job.queue import enqueue
+from member.models import Suggestion, UserFollowing
+
+User = get_user_model()
+
+SUGGESTION_SIZE = 30  # 유저마다 저장해둘 추천 계정 수
+BATCH_SIZE = 200  # 한 번에 계산할 유저 수
+
+
+def compute(user_ids):
+    # user_ids 의 추천 계정을 한 번에 계산해서 저장
+    # 친구의 친구(2-hop)를 함께 아는 친구 수로 세고, 나 자신과 이미 팔로우하는 계정은 제외
+    user_ids = list(user_ids)
+
+    rows = (
+        UserFollowing.objects.filter(
+            from_user__user_followers__from_user_id__in=user_ids,
+            to_user__is_active=True,
+        )
+        .annotate(viewer_id=F('from_user__user_followers__from_user_id'))
+        .values('viewer_id', 'to_user_id')
+        .annotate(mutual_count=Count('pk'))
+        .values_list('viewer_id', 'to_user_id', 'mutual_count')
+    )
+    followed = set(UserFollowing.objects.filter(from_user_id__in=user_ids).values_list('from_user_id', 'to_user_id'))
+
+    candidates = {user_id: [] for user_id in user_ids}
+    for user_id, suggested_id, mutual_count in rows:
+        if suggested_id != user_id and (user_id, suggested_id) not in followed:
+            candidates[user_id].append((mutual_count, suggested_id))
+
+    suggestions = []
+    for user_id, items in candidates.items():
+        items.sort(key=lambda item: (-item[0], item[1]))
+        suggestions += [
+            Suggestion(user_id=user_id, suggested_id=suggested_id, mutual_count=mutual_count)
+            for mutual_count, suggested_id in items[:SUGGESTION_SIZE]
+        ]
+
+    with transaction.atomic():
+        Suggestion.objects.filter(user_id__in=user_ids).delete()
+        Suggestion.objects.bulk_create(suggestions)
+
+
+def refresh_around(user_id):
+    # user_id 의 팔로우가 바뀌면 본인과, user_id 를 거쳐 2-hop 이 바뀌는 팔로워들의 추천이 바뀜
+    compute([user_id])
+
+    follower_ids = UserFollowing.objects.filter(to_user_id=user_id).values_list('from_user_id', flat=True)
+    batch = []
+    for follower_id in follower_ids.iterator():
+        batch.append(follower_id)
+        if len(batch) == BATCH_SIZE:
+            enqueue('member.tasks.refresh_suggestions', batch)
+            batch = []
+    if batch:
+        enqueue('member.tasks.refresh_suggestions', batch)
+
+
+def suggestions_for(user, limit=5):
+    # 미리 계산해둔 추천만 읽음. 계산 이후에 팔로우한 계정은 빼고 보여줌
+    return (
+        Suggestion.objects.filter(user=user)
+        .exclude(suggested__in=UserFollowing.objects.filter(from_user=user).values('to_user'))
+        .select_related('suggested')
+        .order_by('-mutual_count', 'suggested_id')[:limit]
+    )
+
+
+@receiver(post_save, sender=UserFollowing)
+def suggestion_following_save(sender, instance, created, **kwargs):
+    if created:
+        enqueue('member.tasks.refresh_suggestions_around', instance.from_user_id)
+
+
+@receiver(post_delete, sender=UserFollowing)
+def suggestion_following_delete(sender, instance, **kwargs):
+    enqueue('member.tasks.refresh_suggestions_around', instance.from_user_id)
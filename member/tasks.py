@@ -0,0 +1,11 @@
+# 워커(python manage.py runworker)에서 실행되는 작업
+# job.queue.enqueue('member.tasks.<함수 이름>', ...) 로 큐에 넣음
+from member import suggestions
+
+
+def refresh_suggestions(user_ids):
+    suggestions.compute(user_ids)
+
+
+def refresh_suggestions_around(user_id):
+    suggestions.refresh_around(user_id)
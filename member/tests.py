@@ -1,3 +1,268 @@
-from django.test import TestCase
+import json
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from unittest import mock
+from urllib.parse import parse_qs, urlparse
 
-# Create your tests here.
+import httpx
+import requests
+from django.contrib.auth import get_user_model
+from django.core import signing
+from django.http import Http404
+from django.test import AsyncRequestFactory, TestCase
+from django.urls import reverse
+
+from member import oauth_async_views, oauth_views, providers
+from member.search import nickname_index, search_users
+
+User = get_user_model()
+
+
+# 로컬 OAuth 서버 대역
+# responses 에 경로별로 돌려줄 (상태 코드, 본문) 을 순서대로 넣어두면 하나씩 꺼내서 응답함 (마지막 것은 계속 사용)
+class FakeProviderHandler(BaseHTTPRequestHandler):
+    protocol_version = 'HTTP/1.1'  # keep-alive
+    responses = {}
+    requests = []
+    connections = 0
+    delay = 0  # 응답 전에 기다릴 시간 (timeout 확인용)
+
+    def setup(self):
+        super().setup()
+        FakeProviderHandler.connections += 1
+
+    def do_GET(self):
+        path = urlparse(self.path).path
+        FakeProviderHandler.requests.append(path)
+        time.sleep(self.delay)
+
+        queue = self.responses[path]
+        status, body = queue.pop(0) if len(queue) > 1 else queue[0]
+        body = body.encode()
+
+        try:
+            self.send_response(status)
+            self.send_header('Content-Length', str(len(body)))
+            self.end_headers()
+            self.wfile.write(body)
+        except BrokenPipeError:  # timeout 으로 클라이언트가 먼저 끊은 경우
+            pass
+
+    def log_message(self, *args):
+        pass
+
+
+class ProviderTestCase(TestCase):
+
+    @classmethod
+    def setUpClass(cls):
+        super().setUpClass()
+        cls.server = ThreadingHTTPServer(('127.0.0.1', 0), FakeProviderHandler)
+        cls.server.daemon_threads = True
+        threading.Thread(target=cls.server.serve_forever, daemon=True).start()
+        cls.base_url = f'http://127.0.0.1:{cls.server.server_address[1]}'
+
+    @classmethod
+    def tearDownClass(cls):
+        cls.server.shutdown()
+        cls.server.server_close()
+        super().tearDownClass()
+
+    def setUp(self):
+        # 테스트마다 새 연결 풀로 시작
+        self.enterContext(mock.patch.object(providers, 'session', providers.create_session()))
+        self.enterContext(mock.patch.object(providers, 'BACKOFF', 0.01))
+        self.enterContext(mock.patch.object(oauth_views, 'GITHUB_TOKEN_URL', f'{self.base_url}/token'))
+        self.enterContext(mock.patch.object(oauth_views, 'GITHUB_PROFILE_URL', f'{self.base_url}/user'))
+        FakeProviderHandler.responses = {
+            '/token': [(200, 'access_token=fake-token&token_type=bearer')],
+            '/user': [(200, json.dumps({'login': 'octocat', 'email': 'octocat@example.com'}))],
+        }
+        FakeProviderHandler.requests = []
+        FakeProviderHandler.connections = 0
+        FakeProviderHandler.delay = 0
+
+    def tearDown(self):
+        providers.session.close()
+
+    def github_callback(self):
+        return self.client.get(reverse('oauth:github_callback'), {
+            'code': 'fake-code',
+            'state': signing.dumps(oauth_views.GITHUB_STATE),
+        })
+
+
+class ProviderClientTest(ProviderTestCase):
+
+    def test_reuses_connection(self):
+        for _ in range(5):
+            self.assertEqual(providers.get(f'{self.base_url}/user').status_code, 200)
+
+        self.assertEqual(len(FakeProviderHandler.requests), 5)
+        self.assertEqual(FakeProviderHandler.connections, 1)
+
+    def test_retries_temporary_errors(self):
+        FakeProviderHandler.responses['/user'] = [(503, ''), (502, ''), (200, '{}')]
+
+        response = providers.get(f'{self.base_url}/user')
+
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(len(FakeProviderHandler.requests), 3)
+
+    def test_gives_up_after_max_retries(self):
+        FakeProviderHandler.responses['/user'] = [(503, '')]
+
+        response = providers.get(f'{self.base_url}/user')
+
+        self.assertEqual(response.status_code, 503)
+        self.assertEqual(len(FakeProviderHandler.requests), providers.MAX_RETRIES + 1)
+
+    def test_does_not_retry_client_errors(self):
+        FakeProviderHandler.responses['/user'] = [(401, '')]
+
+        self.assertEqual(providers.get(f'{self.base_url}/user').status_code, 401)
+        self.assertEqual(len(FakeProviderHandler.requests), 1)
+
+    def test_read_timeout(self):
+        FakeProviderHandler.delay = 0.5
+
+        with mock.patch.object(providers, 'TIMEOUT', (1, 0.1)):
+            with self.assertRaises(requests.Timeout):
+                providers.get(f'{self.base_url}/user')
+
+        # 응답 대기 중 timeout 은 다시 시도하지 않음
+        self.assertEqual(len(FakeProviderHandler.requests), 1)
+
+    def test_no_retry(self):
+        FakeProviderHandler.responses['/token'] = [(503, ''), (200, 'access_token=fake-token')]
+
+        self.assertEqual(providers.get(f'{self.base_url}/token', retry=False).status_code, 503)
+        self.assertEqual(len(FakeProviderHandler.requests), 1)
+
+    def test_retries_connection_errors(self):
+        with mock.patch.object(providers.session, 'get', side_effect=requests.ConnectionError) as get:
+            with self.assertRaises(requests.ConnectionError):
+                providers.get(f'{self.base_url}/user')
+
+        self.assertEqual(get.call_count, providers.MAX_RETRIES + 1)
+
+
+class AsyncProviderClientTest(ProviderTestCase):
+    # providers.aget() 은 get() 과 같은 재시도 정책을 따름
+
+    async def aget(self, path, **kwargs):
+        return await providers.aget(f'{self.base_url}{path}', **kwargs)
+
+    async def test_reuses_connection(self):
+        for _ in range(5):
+            self.assertEqual((await self.aget('/user')).status_code, 200)
+
+        self.assertEqual(len(FakeProviderHandler.requests), 5)
+        self.assertEqual(FakeProviderHandler.connections, 1)
+        await providers.get_async_client().aclose()
+
+    async def test_retries_temporary_errors(self):
+        FakeProviderHandler.responses['/user'] = [(503, ''), (502, ''), (200, '{}')]
+
+        self.assertEqual((await self.aget('/user')).status_code, 200)
+        self.assertEqual(len(FakeProviderHandler.requests), 3)
+        await providers.get_async_client().aclose()
+
+    async def test_no_retry(self):
+        FakeProviderHandler.responses['/token'] = [(503, ''), (200, 'access_token=fake-token')]
+
+        self.assertEqual((await self.aget('/token', retry=False)).status_code, 503)
+        self.assertEqual(len(FakeProviderHandler.requests), 1)
+        await providers.get_async_client().aclose()
+
+    async def test_retries_connection_errors(self):
+        with mock.patch.object(httpx.AsyncClient, 'get', side_effect=httpx.ConnectError('refused')) as get:
+            with self.assertRaises(httpx.ConnectError):
+                await self.aget('/user')
+
+        self.assertEqual(get.call_count, providers.MAX_RETRIES + 1)
+        await providers.get_async_client().aclose()
+
+    async def test_async_callback_does_not_retry_token_exchange(self):
+        FakeProviderHandler.responses['/token'] = [(503, ''), (200, 'access_token=fake-token')]
+        request = AsyncRequestFactory().get('/', {'code': 'fake-code', 'state': signing.dumps(oauth_views.GITHUB_STATE)})
+
+        with self.assertRaises(Http404):
+            await oauth_async_views.github_callback(request)
+        self.assertEqual(FakeProviderHandler.requests, ['/token'])
+        await providers.get_async_client().aclose()
+
+
+class OAuthSignupTest(ProviderTestCase):
+
+    def test_signup_uses_profile_from_callback(self):
+        response = self.github_callback()
+
+        self.assertEqual(response.status_code, 302)
+        url = urlparse(response.url)
+        self.assertEqual(url.path, reverse('oauth:nickname'))
+        self.assertEqual(parse_qs(url.query).keys(), {'profile'})
+        self.assertNotIn('fake-token', response.url)  # access_token 이 URL(브라우저 기록, 로그)에 남지 않음
+        self.assertEqual(FakeProviderHandler.requests, ['/token', '/user'])
+
+        response = self.client.post(response.url, {'nickname': 'octocat'})
+
+        self.assertRedirects(response, reverse('main'), fetch_redirect_response=False)
+        user = User.objects.get(email='octocat@example.com')
+        self.assertEqual(user.nickname, 'octocat')
+        self.assertTrue(user.is_active)
+        # 닉네임 입력 단계에서 프로필을 다시 조회하지 않음
+        self.assertEqual(FakeProviderHandler.requests, ['/token', '/user'])
+
+    def test_existing_user_logs_in(self):
+        User.objects.create(email='octocat@example.com', nickname='octocat', is_active=False)
+
+        response = self.github_callback()
+
+        self.assertRedirects(response, reverse('main'), fetch_redirect_response=False)
+        self.assertTrue(User.objects.get(email='octocat@example.com').is_active)
+
+    def test_token_exchange_is_not_retried(self):
+        # 인가 코드는 한 번만 쓸 수 있으므로 토큰 발급 실패는 다시 보내지 않고, 프로필 조회는 다시 시도함
+        FakeProviderHandler.responses['/token'] = [(503, ''), (200, 'access_token=fake-token')]
+
+        self.assertEqual(self.github_callback().status_code, 404)
+        self.assertEqual(FakeProviderHandler.requests, ['/token'])
+
+        FakeProviderHandler.requests = []
+        FakeProviderHandler.responses['/user'] = [(503, ''), (200, json.dumps({'login': 'octocat'}))]
+
+        self.assertEqual(self.github_callback().status_code, 302)
+        self.assertEqual(FakeProviderHandler.requests, ['/token', '/user', '/user'])
+
+    def test_rejects_tampered_profile(self):
+        profile = providers.dump_profile('github', 'octocat@example.com')
+
+        response = self.client.post(reverse('oauth:nickname') + f'?profile={profile[:-1]}x', {'nickname': 'octocat'})
+
+        self.assertRedirects(response, reverse('login'), fetch_redirect_response=False)
+        self.assertFalse(User.objects.filter(email='octocat@example.com').exists())
+
+    def test_rejects_expired_profile(self):
+        profile = providers.dump_profile('github', 'octocat@example.com')
+
+        with mock.patch.object(providers, 'PROFILE_MAX_AGE', -1):
+            response = self.client.post(reverse('oauth:nickname') + f'?profile={profile}', {'nickname': 'octocat'})
+
+        self.assertRedirects(response, reverse('login'), fetch_redirect_response=False)
+        self.assertFalse(User.objects.filter(email='octocat@example.com').exists())
+
+
+class UserSearchTest(TestCase):
+
+    @classmethod
+    def setUpTestData(cls):
+        User.objects.create(email='active@example.com', nickname='octocat', is_active=True)
+        User.objects.create(email='inactive@example.com', nickname='octodog', is_active=False)
+        User.objects.create(email='inactive2@example.com', nickname='my_octo', is_active=False)
+
+    def test_search_and_autocomplete_skip_inactive_users(self):
+        # 접두어 검색과 trigram(중간 일치) 검색 모두
+        self.assertEqual([user.nickname for user in search_users('octo')], ['octocat'])
+        self.assertEqual(nickname_index.complete('octo'), ['octocat'])
@@ -5,4 +5,6 @@ app_name = 'profile'
 urlpatterns = [
     path('<str:slug>/', views.UserProfileView.as_view(), name='detail'),
     path('<int:pk>/follow/', views.UserFollowingView.as_view(), name='follow'),
+    path('<int:pk>/followers/', views.follower_list, name='followers'),
+    path('<int:pk>/following/', views.following_list, name='following'),
 ]
\ No newline at end of file
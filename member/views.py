@@ -1,9 +1,13 @@
+from urllib.parse import urlencode
+
 from django.conf import settings
 from django.contrib.auth import get_user_model, login
 from django.contrib.auth.mixins import LoginRequiredMixin
 from django.core import signing
 from django.core.signing import TimestampSigner, SignatureExpired
-from django.http import HttpResponseRedirect, Http404
+from django.db import transaction
+from django.db.models import F, Prefetch
+from django.http import HttpResponseRedirect, Http404, JsonResponse
 from django.shortcuts import render, get_object_or_404, redirect
 from django.urls import reverse_lazy, reverse
 from django.views import View
@@ -11,7 +15,14 @@ from django.views.generic import FormView, DetailView
 
 from member.forms import SignupForm, LoginForm
 from member.models import UserFollowing
+from member.search import nickname_index
+from member.suggestions import suggestions_for
+from post.models import Post, PostImage
 from utils.email import send_email
+from utils.pagecache import AnonymousPageCacheMixin
+from utils.pagination import CursorPaginator
+from utils.replica import ReplicaMixin
+from utils.query import top_n_per_group
 
 User = get_user_model()
 
@@ -54,6 +65,7 @@ class SignupView(FormView):
             subject = '[Pystagram]이메일 인증을 완료해주세요'
             message = f'다음 링크를 클릭해주세요. <br><a href="{url}">{url}</a>'
 
+            # 보낼 메일함에 넣기만 하고 바로 응답 (발송은 deliver_outbox)
             send_email(subject, message, user.email)
 
         return render(
@@ -100,21 +112,44 @@ class LoginView(FormView):
 
         return HttpResponseRedirect(self.get_success_url())
 
-class UserProfileView(DetailView):
+class UserProfileView(ReplicaMixin, AnonymousPageCacheMixin, DetailView):
     model = User
     template_name = 'profile/detail.html'
     # pk대신 nickname으로 가져오기 위해 slug사용
     slug_field = 'nickname'
     slug_url_kwarg = 'slug'
-    queryset = User.objects.all().prefetch_related("post_set", "post_set__images", "following", "followers")  # post의 이미지를 불러올때 __사용
+    queryset = User.objects.all()
+    paginate_by = 12
+
+    def get_page_etag(self):
+        # 로그인하지 않은 유저의 프로필: 유저 정보/카운터 + 이 페이지에 보일 글의 (id, 버전)
+        user = self.get_object()
+        queryset = Post.objects.filter(user=user).only('id', 'created_at', 'version')
+        page = CursorPaginator(queryset, self.paginate_by).get_page(self.request.GET.get('cursor'))
+        return [
+            [user.pk, user.nickname, user.post_count, user.follower_count, user.following_count],
+            [[post.pk, post.version] for post in page],
+            page.next_cursor,
+        ]
 
     def get_context_data(self, **kwargs):
         data = super().get_context_data(**kwargs)
+        # 글/팔로워/팔로잉 수는 User 의 카운터 필드를 사용하고,
+        # 글 목록은 첫 페이지만, 글마다 대표 이미지 한 장만 불러옴 (다음 페이지는 ?cursor=)
+        # 팔로워/팔로잉 목록은 모달을 열 때 profile:followers / profile:following 에서 불러옴
+        cover = top_n_per_group(PostImage.objects.prefetch_related('variants'), 'post', ['id'], 1)
+        queryset = Post.objects.filter(user=self.object).prefetch_related(
+            Prefetch('images', queryset=cover, to_attr='cover_images')
+        )
+        data['page_obj'] = CursorPaginator(queryset, self.paginate_by).get_page(self.request.GET.get('cursor'))
+
         if self.request.user.is_authenticated:
             data['is_follow'] = UserFollowing.objects.filter(
                 to_user = self.object,
                 from_user = self.request.user
-            )
+            ).exists()
+            if self.object == self.request.user:
+                data['suggestions'] = suggestions_for(self.request.user)
         return data
 
 class UserFollowingView(LoginRequiredMixin, View):
@@ -139,16 +174,72 @@ class UserFollowingView(LoginRequiredMixin, View):
         if to_user == self.request.user:
             raise Http404
 
-        following, created = UserFollowing.objects.get_or_create(
-            to_user=to_user,
-            from_user=self.request.user
-        )
+        # 팔로우 행과 양쪽 유저의 카운터가 함께 바뀌도록 하나의 트랜잭션으로 처리
+        with transaction.atomic():
+            following, created = UserFollowing.objects.get_or_create(
+                to_user=to_user,
+                from_user=self.request.user
+            )
 
-        if not created:
-            following.delete()
+            if created:
+                User.objects.filter(pk=to_user.pk).update(follower_count=F('follower_count') + 1)
+                User.objects.filter(pk=self.request.user.pk).update(following_count=F('following_count') + 1)
+            else:
+                following.delete()
+                User.objects.filter(pk=to_user.pk, follower_count__gt=0).update(follower_count=F('follower_count') - 1)
+                User.objects.filter(pk=self.request.user.pk, following_count__gt=0).update(following_count=F('following_count') - 1)
 
         return HttpResponseRedirect(
             reverse('profile:detail', kwargs={'slug': to_user.nickname})
         )
 
-        # 안되어있으면 팔로우 시작 => UserFollowing row 생성
\ No newline at end of file
+        # 안되어있으면 팔로우 시작 => UserFollowing row 생성
+
+
+# 닉네임 자동완성
+# DB 대신 메모리의 정렬된 닉네임 목록에서 찾음
+def nickname_autocomplete(request):
+    q = request.GET.get('q', '')
+    return JsonResponse({'results': nickname_index.complete(q, limit=10)})
+
+
+# 팔로워/팔로잉 목록 (프로필 모달에서 페이지 단위로 불러옴)
+def follow_list(request, queryset, user_field, url):
+    page = CursorPaginator(queryset.select_related(user_field), 30).get_page(request.GET.get('cursor'))
+
+    next_url = None
+    if page.has_next():
+        next_url = f"{url}?{urlencode({'cursor': page.next_cursor})}"
+
+    users = [getattr(following, user_field) for following in page]
+
+    # 페이지에 있는 유저 중 내가 팔로우하는 유저를 한 번에 조회
+    followed = set()
+    if request.user.is_authenticated and users:
+        followed = set(
+            UserFollowing.objects.filter(from_user=request.user, to_user__in=users).values_list('to_user_id', flat=True)
+        )
+
+    return JsonResponse({
+        'users': [
+            {
+                'nickname': user.nickname,
+                'url': reverse('profile:detail', kwargs={'slug': user.nickname}),
+                'is_followed': user.pk in followed,
+            }
+            for user in users
+        ],
+        'next': next_url,
+    })
+
+
+def follower_list(request, pk):
+    # pk 유저를 팔로우하는 유저
+    queryset = UserFollowing.objects.filter(to_user_id=pk)
+    return follow_list(request, queryset, 'from_user', reverse('profile:followers', args=[pk]))
+
+
+def following_list(request, pk):
+    # pk 유저가 팔로우하는 유저
+    queryset = UserFollowing.objects.filter(from_user_id=pk)
+    return follow_list(request, queryset, 'to_user', reverse('profile:following', args=[pk]))
@@ -4,3 +4,7 @@ from django.apps import AppConfig
 class PostConfig(AppConfig):
     default_auto_field = 'django.db.models.BigAutoField'
     name = 'post'
+
+    def ready(self):
+        # signal 등록
+        from post import images, postings, search, timeline  # noqa
@@ -0,0 +1,150 @@
+from asgiref.sync import sync_to_async
+from django.contrib.auth.decorators import login_required
+from django.db.models import Prefetch
+from django.http import Http404, JsonResponse
+from django.template.response import TemplateResponse
+from django.views.decorators.csrf import csrf_exempt
+
+from member.search import search_users
+from member.suggestions import suggestions_for
+from post import likes, postings
+from post.forms import CommentForm
+from post.models import Like, Post, PostImage, Tag, normalize_tag
+from post.search import search_posts
+from post.timeline import timeline_page
+from post.views import PostListView, set_more_comments_cursor
+from utils.pagecache import acached_page
+from utils.pagination import CursorPage, CursorPaginator, decode_cursor, encode_cursor
+from utils.query import top_n_per_group
+from utils.replica import replica_view
+
+# ASGI(uvicorn 등)로 실행할 때 사용하는 async 버전의 피드/좋아요/검색 (settings.ASYNC_VIEWS)
+# 쿼리를 기다리는 동안 이벤트 루프가 다른 요청을 처리함
+# - 조회는 async ORM (async for, afirst, ain_bulk)
+# - 트랜잭션이 필요한 부분(좋아요)과 여러 쿼리를 묶은 기존 함수는 sync_to_async 로 실행
+# - 템플릿은 TemplateResponse 로 반환하고 replica_view 가 replica 설정 안에서 스레드로 렌더링함 (템플릿 안의 lazy 조회 대비)
+
+
+@replica_view
+async def feed(request):
+    user = await request.auser()
+    request.user = user  # 템플릿에서 request.user 를 읽을 때 다시 조회하지 않도록
+
+    view = PostListView()
+    view.setup(request)
+
+    # 로그인하지 않은 유저는 PostListView 와 같은 ETag/페이지 캐시 (utils.pagecache)
+    if request.method in ('GET', 'HEAD') and not user.is_authenticated:
+        values = await sync_to_async(view.get_page_etag)()
+        if values is not None:
+            return await acached_page(request, values, lambda: feed_page(request, user, view))
+
+    return await feed_page(request, user, view)
+
+
+async def feed_page(request, user, view):
+    queryset = view.get_queryset()
+    cursor = request.GET.get(view.cursor_kwarg)
+
+    # 로그인한 유저는 팔로우한 사람들의 글로 만든 타임라인 (post.timeline 참고)
+    if user.is_authenticated:
+        page = await sync_to_async(timeline_page)(user, cursor, view.paginate_by)
+        posts = await queryset.filter(pk__in=page.object_list).order_by().ain_bulk()
+        page.object_list = [posts[pk] for pk in page.object_list if pk in posts]
+    else:
+        page = await CursorPaginator(queryset, view.paginate_by, view.cursor_ordering).aget_page(cursor)
+
+    set_more_comments_cursor(page.object_list)
+
+    context = {
+        'page_obj': page,
+        'object_list': page.object_list,
+        'comment_form': CommentForm(),
+        'liked_post_ids': set(),
+    }
+    if user.is_authenticated:
+        context['liked_post_ids'] = {
+            post_id async for post_id in Like.objects.filter(
+                user=user,
+                post_id__in=[post.pk for post in page.object_list],
+            ).values_list('post_id', flat=True)
+        }
+        if not cursor:
+            context['suggestions'] = [suggestion async for suggestion in suggestions_for(user)]
+
+    return TemplateResponse(request, view.template_name, context)
+
+
+@csrf_exempt
+@login_required
+async def toggle_like(request):
+    post_pk = request.POST.get('post_pk', '')
+    if not post_pk.isdigit():
+        raise Http404()
+
+    # async ORM 은 트랜잭션을 지원하지 않으므로 좋아요 행과 카운터를 함께 바꾸는 부분은
+    # sync_to_async 로 한 스레드에서 실행 (post.likes 참고)
+    user = await request.auser()
+    try:
+        created, like_count = await sync_to_async(likes.toggle_like)(user, int(post_pk))
+    except Post.DoesNotExist:
+        raise Http404()
+
+    return JsonResponse({'created': created, 'like_count': like_count})
+
+
+@replica_view
+async def search(request):
+    search_type = request.GET.get('type')  # user, tag, content
+    q = request.GET.get('q', '')
+
+    if search_type not in ['user', 'tag', 'content']:
+        return TemplateResponse(request, 'search/search.html')
+
+    context = {}
+    if search_type == 'user':
+        object_list = await sync_to_async(search_users)(q)
+    elif search_type == 'tag':
+        # post.views.search 와 같은 방식 (태그 하나는 글-태그 연결 테이블을 keyset 으로, 여러 태그 조합은 포스팅 리스트로)
+        tag = None
+        if postings.is_boolean_query(q):
+            ids = await sync_to_async(postings.evaluate)(q)
+            context['result_count'] = len(ids)
+            before = decode_cursor(request.GET.get('cursor'))
+            before = before[0] if before and len(before) == 1 and isinstance(before[0], int) else None
+            post_ids, has_more = postings.page(ids, before, 12)
+            next_cursor = encode_cursor([post_ids[-1]]) if has_more else None
+        else:
+            tag = await Tag.objects.filter(tag=normalize_tag(q.lstrip('#'))).afirst()
+            links = CursorPage([])
+            if tag:
+                links = await CursorPaginator(
+                    Tag.posts.through.objects.filter(tag=tag).only('post_id'), 12, ordering=('-post_id',)
+                ).aget_page(request.GET.get('cursor'))
+            post_ids = [link.post_id for link in links]
+            next_cursor = links.next_cursor
+
+        cover = top_n_per_group(PostImage.objects.prefetch_related('variants'), 'post', ['id'], 1)
+        posts = await Post.objects.prefetch_related(
+            Prefetch('images', queryset=cover, to_attr='cover_images')
+        ).ain_bulk(post_ids)
+        page = CursorPage([posts[pk] for pk in post_ids if pk in posts], next_cursor)
+
+        object_list = page.object_list
+        context.update({
+            'tag': tag,
+            'page_obj': page,
+        })
+    else:
+        page = request.GET.get('page', '1')
+        page = int(page) if page.isdigit() and int(page) > 0 else 1
+        object_list, has_next = await sync_to_async(search_posts)(q, page)
+        context.update({
+            'page': page,
+            'previous_page': page - 1,
+            'next_page': page + 1 if has_next else None,
+        })
+
+    context['object_list'] = object_list
+
+    return TemplateResponse(request, f'search/search_{search_type}.html', context)
@@ -4,4 +4,5 @@ from . import comment_views as views
 app_name = 'comment'
 urlpatterns = [
     path('create/<int:post_pk>', views.CommentCreateView.as_view(), name='create'),
+    path('list/<int:post_pk>', views.comment_list, name='list'),
 ]
\ No newline at end of file
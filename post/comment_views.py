@@ -1,10 +1,15 @@
+from urllib.parse import urlencode
+
 from django.contrib.auth.mixins import LoginRequiredMixin
-from django.http import HttpResponseRedirect
+from django.db import transaction
+from django.db.models import F
+from django.http import HttpResponseRedirect, JsonResponse
 from django.urls import reverse
 from django.views.generic import CreateView
 
 from post.forms import CommentForm
 from post.models import Comment, Post
+from utils.pagination import CursorPaginator
 
 
 class CommentCreateView(LoginRequiredMixin, CreateView):
@@ -19,6 +24,25 @@ class CommentCreateView(LoginRequiredMixin, CreateView):
         post = Post.objects.get(pk=self.kwargs.get('post_pk'))
         self.object.post = post
 
-        self.object.save()
+        # 댓글 저장과 댓글 수 증가를 하나의 트랜잭션으로 처리
+        with transaction.atomic():
+            self.object.save()
+            Post.objects.filter(pk=post.pk).update(comment_count=F('comment_count') + 1, version=F('version') + 1)
+
+        return HttpResponseRedirect(reverse('main'))
+
+# 피드에서 미리 보여준 댓글 이후의(더 오래된) 댓글을 페이지 단위로 불러옴
+def comment_list(request, post_pk):
+    queryset = Comment.objects.filter(post_id=post_pk).select_related('user')
+    page = CursorPaginator(queryset, 20).get_page(request.GET.get('cursor'))
+
+    next_url = None
+    if page.has_next():
+        next_url = f"{reverse('comment:list', args=[post_pk])}?{urlencode({'cursor': page.next_cursor})}"
 
-        return HttpResponseRedirect(reverse('main'))
\ No newline at end of file
+    return JsonResponse({
+        'comments': [
+            {'user': comment.user.nickname, 'content': comment.content} for comment in page
+        ],
+        'next': next_url,
+    })
@@ -0,0 +1,84 @@
+import hashlib
+from io import BytesIO
+
+from django.core.files.base import ContentFile
+from django.db import transaction
+from django.db.models import F
+from django.db.models.signals import post_init, post_save
+from django.dispatch import receiver
+from PIL import Image, ImageOps
+
+from job.queue import enqueue
+from post.models import Post, PostImage, PostImageVariant
+
+# 만들어둘 너비. 원본보다 큰 너비는 만들지 않음
+VARIANT_WIDTHS = (320, 640, 1080)
+# 형식별 저장 옵션
+VARIANT_FORMATS = {
+    'webp': {'format': 'WEBP', 'quality': 80, 'method': 4},
+    'jpeg': {'format': 'JPEG', 'quality': 82, 'optimize': True, 'progressive': True},
+}
+
+
+def encode(image, fmt):
+    buffer = BytesIO()
+    image.save(buffer, **VARIANT_FORMATS[fmt])
+    return buffer.getvalue()
+
+
+def store(storage, data, fmt):
+    # 내용의 해시값을 파일 이름으로 사용 -> 같은 내용은 같은 URL (영구 캐시 가능)
+    digest = hashlib.sha256(data).hexdigest()
+    name = f'post/variants/{digest[:2]}/{digest}.{fmt}'
+    if not storage.exists(name):
+        name = storage.save(name, ContentFile(data))
+    return name
+
+
+def generate_variants(post_image):
+    field = post_image.image
+    storage = field.storage
+
+    with field.open('rb') as f:
+        original = Image.open(f)
+        original = ImageOps.exif_transpose(original)  # 휴대폰 사진의 회전 정보 반영
+        original = original.convert('RGB')
+
+    widths = [width for width in VARIANT_WIDTHS if width < original.width] or [original.width]
+    if original.width not in widths and original.width < VARIANT_WIDTHS[-1]:
+        widths.append(original.width)
+
+    variants = []
+    for width in widths:
+        height = round(original.height * width / original.width)
+        resized = original.resize((width, height), Image.Resampling.LANCZOS)
+
+        for fmt in VARIANT_FORMATS:
+            variants.append(PostImageVariant(
+                post_image=post_image,
+                image=store(storage, encode(resized, fmt), fmt),
+                format=fmt,
+                width=width,
+                height=height,
+            ))
+
+    with transaction.atomic():
+        post_image.variants.all().delete()
+        PostImageVariant.objects.bulk_create(variants)
+        # 피드 카드가 새 이미지 크기로 다시 그려지도록 글의 버전을 올림
+        Post.objects.filter(pk=post_image.post_id).update(version=F('version') + 1)
+
+    return variants
+
+
+@receiver(post_init, sender=PostImage)
+def post_image_post_init(sender, instance, **kwargs):
+    # 이미지가 바뀌었는지 확인하기 위해 불러올 때의 파일 이름을 기억해둠
+    instance._loaded_image_name = instance.__dict__.get('image')
+
+
+@receiver(post_save, sender=PostImage)
+def post_image_post_save(sender, instance, created, **kwargs):
+    if created or instance.image.name != instance._loaded_image_name:
+        instance._loaded_image_name = instance.image.name
+        enqueue('post.tasks.generate_image_variants', instance.pk)  # 워커에서 처리
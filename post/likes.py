@@ -0,0 +1,53 @@
+from django.db import IntegrityError, transaction
+from django.db.models import F
+
+from post.models import Like, Post
+
+# 좋아요 추가/취소
+# Post 를 먼저 조회하지 않고 Like 행을 바로 넣거나 지운 뒤 카운터만 F() 로 갱신함
+# (post, user) unique 제약 때문에 동시에 두 번 눌러도 좋아요는 한 행만 생김
+# 좋아요 수는 캐시된 글 카드 밖에서 그리므로 Post.version 은 올리지 않음
+
+
+def like_count(post_id):
+    return Post.objects.filter(pk=post_id).values_list('like_count', flat=True).first()
+
+
+def set_like(user, post_id, liked):
+    # 좋아요 상태를 liked 로 맞춤. 실제로 바뀌었으면 True
+    # 글이 없으면 Post.DoesNotExist (트랜잭션 안에서 호출하면 넣은 행도 함께 롤백됨)
+    if liked:
+        try:
+            with transaction.atomic():
+                Like.objects.create(post_id=post_id, user=user)
+        except IntegrityError:  # 이미 좋아요 한 상태
+            return False
+        if not Post.objects.filter(pk=post_id).update(like_count=F('like_count') + 1):
+            raise Post.DoesNotExist
+        return True
+
+    # Like 에는 연결된 모델/시그널이 없어서 SELECT 없이 DELETE 한 번으로 지워짐
+    deleted, _ = Like.objects.filter(post_id=post_id, user=user).delete()
+    if deleted:
+        Post.objects.filter(pk=post_id, like_count__gt=0).update(like_count=F('like_count') - 1)
+    return bool(deleted)
+
+
+def toggle_like(user, post_id):
+    # 지워진 행이 없으면 좋아요 추가. (좋아요 여부, 좋아요 수) 반환
+    with transaction.atomic():
+        liked = not set_like(user, post_id, False)
+        if liked:
+            set_like(user, post_id, True)
+        return liked, like_count(post_id)
+
+
+def sync_likes(user, states):
+    # 오프라인에서 쌓인 좋아요 상태 {post_id: liked} 를 한 트랜잭션으로 반영
+    # 없는 글은 건너뜀. {post_id: 좋아요 수} 반환
+    with transaction.atomic():
+        post_ids = set(Post.objects.filter(pk__in=states).values_list('pk', flat=True))
+        for post_id, liked in states.items():
+            if post_id in post_ids:
+                set_like(user, post_id, liked)
+        return dict(Post.objects.filter(pk__in=post_ids).values_list('pk', 'like_count'))
@@ -0,0 +1,51 @@
+import time
+
+from django.contrib.auth import get_user_model
+from django.core.management.base import BaseCommand
+from django.test import Client
+from django.test.utils import override_settings
+from django.urls import reverse
+
+User = get_user_model()
+
+
+class Command(BaseCommand):
+    help = '로그인하지 않은 상태로 피드/프로필을 반복 요청해서 바뀌지 않은 페이지의 초당 요청 수를 비교합니다.'
+
+    def add_arguments(self, parser):
+        parser.add_argument('-n', '--requests', type=int, default=200, help='경우마다 보낼 요청 수')
+        parser.add_argument('--nickname', help='프로필을 확인할 유저 (기본: 글이 가장 많은 유저)')
+        parser.add_argument('--host', default='localhost', help='ALLOWED_HOSTS 에 있는 호스트')
+
+    def handle(self, *args, **options):
+        urls = [reverse('main')]
+        user = User.objects.order_by('-post_count').first()
+        if options['nickname']:
+            user = User.objects.get(nickname=options['nickname'])
+        if user:
+            urls.append(reverse('profile:detail', kwargs={'slug': user.nickname}))
+
+        client = Client(HTTP_HOST=options['host'])
+        for url in urls:
+            self.stdout.write(url)
+
+            # 이전 방식: 매번 렌더링
+            with override_settings(PAGE_CACHE_TIMEOUT=0):
+                self.report('no page cache', client, url, options['requests'])
+
+            # 두 번째 요청부터 페이지 캐시에서 응답
+            response = self.report('page cache', client, url, options['requests'])
+
+            # 브라우저가 ETag 를 다시 보내면 304
+            self.report('conditional (304)', client, url, options['requests'], HTTP_IF_NONE_MATCH=response['ETag'])
+
+    def report(self, name, client, url, count, **headers):
+        response = client.get(url, **headers)  # 준비 요청
+
+        started = time.perf_counter()
+        for _ in range(count):
+            response = client.get(url, **headers)
+        elapsed = time.perf_counter() - started
+
+        self.stdout.write(f'  {name:<20} {response.status_code}  {count / elapsed:8.1f} req/s')
+        return response
@@ -0,0 +1,104 @@
+import random
+import sqlite3
+import tempfile
+import threading
+import time
+from contextlib import closing
+from pathlib import Path
+
+from django.conf import settings
+from django.core.management.base import BaseCommand, CommandError
+from django.db import OperationalError, connections, transaction
+from django.db.models import F
+
+from post.models import Comment, Post
+
+
+class Command(BaseCommand):
+    help = '여러 스레드가 피드 읽기와 좋아요/댓글 쓰기를 섞어서 실행할 때 SQLite 설정별 처리량을 비교합니다.'
+
+    def add_arguments(self, parser):
+        parser.add_argument('-t', '--threads', type=int, default=16)
+        parser.add_argument('-d', '--duration', type=float, default=5, help='설정마다 실행할 시간(초)')
+        parser.add_argument('--writes', type=float, default=0.2, help='쓰기 비율 (0 ~ 1)')
+
+    def handle(self, *args, **options):
+        default = settings.DATABASES['default']
+        if default['ENGINE'] != 'django.db.backends.sqlite3':
+            raise CommandError('SQLite 전용 벤치마크입니다.')
+
+        post_ids = list(Post.objects.values_list('pk', flat=True)[:1000])
+        user_ids = list(Post.objects.values_list('user_id', flat=True).distinct()[:100])
+        if not post_ids:
+            raise CommandError('글이 하나 이상 있어야 합니다.')
+
+        modes = [
+            ('before (defaults)', {}),
+            ('after (config.base)', default.get('OPTIONS', {})),
+        ]
+        with tempfile.TemporaryDirectory() as tmp:
+            for name, db_options in modes:
+                # 설정마다 DB 파일을 복사해서 사용 (journal_mode 는 파일에 저장되므로)
+                path = Path(tmp) / f'{len(connections.settings)}.sqlite3'
+                self.copy_database(default['NAME'], path)
+                alias = f'bench_{path.stem}'
+                connections.settings[alias] = connections.configure_settings({
+                    'default': {'ENGINE': default['ENGINE'], 'NAME': str(path), 'OPTIONS': db_options},
+                })['default']
+
+                reads, writes, errors, elapsed = self.run(alias, post_ids, user_ids, options)
+                self.stdout.write(
+                    f'{name:<22} {(reads + writes) / elapsed:8.1f} ops/s  {writes / elapsed:7.1f} writes/s  '
+                    f'(reads {reads}, writes {writes}, locked errors {errors})'
+                )
+
+    def copy_database(self, source, path):
+        # 파일 복사 대신 backup API 를 사용해야 아직 -wal 파일에만 있는 내용도 함께 복사됨
+        # 개발 DB 가 이미 WAL 로 바뀌어 있어도 비교 기준은 SQLite 기본값(rollback journal)에서 시작
+        with closing(sqlite3.connect(source)) as src, closing(sqlite3.connect(path)) as dst:
+            src.backup(dst)
+            dst.execute('PRAGMA journal_mode=DELETE')
+
+    def run(self, alias, post_ids, user_ids, options):
+        counts = {'reads': 0, 'writes': 0, 'errors': 0}
+        lock = threading.Lock()
+        deadline = time.monotonic() + options['duration']
+
+        def worker():
+            reads = writes = errors = 0
+            while time.monotonic() < deadline:
+                try:
+                    if random.random() < options['writes']:
+                        # 댓글 작성: 글을 읽고 댓글 추가 + 카운터 갱신을 한 트랜잭션으로
+                        # (읽기로 시작한 트랜잭션이 쓰기로 바뀌는 경우)
+                        post_id = random.choice(post_ids)
+                        with transaction.atomic(using=alias):
+                            post = Post.objects.using(alias).get(pk=post_id)
+                            Comment.objects.using(alias).create(
+                                post=post, user_id=random.choice(user_ids), content='bench'
+                            )
+                            Post.objects.using(alias).filter(pk=post_id).update(
+                                comment_count=F('comment_count') + 1
+                            )
+                        writes += 1
+                    else:
+                        # 피드 한 페이지
+                        list(Post.objects.using(alias).order_by('-created_at', '-id')[:5])
+                        reads += 1
+                except OperationalError:  # database is locked
+                    errors += 1
+            connections[alias].close()
+
+            with lock:
+                counts['reads'] += reads
+                counts['writes'] += writes
+                counts['errors'] += errors
+
+        started = time.monotonic()
+        threads = [threading.Thread(target=worker) for _ in range(options['threads'])]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+
+        return counts['reads'], counts['writes'], counts['errors'], time.monotonic() - started
@@ -0,0 +1,24 @@
+from django.core.management.base import BaseCommand
+
+from post.images import generate_variants
+from post.models import PostImage
+
+
+class Command(BaseCommand):
+    help = '업로드된 이미지의 썸네일/WebP 변환본을 만듭니다.'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--all', action='store_true', help='이미 변환본이 있는 이미지도 다시 만듦')
+
+    def handle(self, *args, **options):
+        images = PostImage.objects.all()
+        if not options['all']:
+            images = images.filter(variants__isnull=True)
+
+        for post_image in images.iterator():
+            try:
+                variants = generate_variants(post_image)
+            except (OSError, ValueError) as e:  # 파일이 없거나 이미지가 아닌 경우
+                self.stderr.write(f'{post_image.image.name}: {e}')
+                continue
+            self.stdout.write(f'{post_image.image.name}: {len(variants)} variants')
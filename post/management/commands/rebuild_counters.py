@@ -0,0 +1,55 @@
+from django.contrib.auth import get_user_model
+from django.core.management.base import BaseCommand
+from django.db import transaction
+from django.db.models import Count, F, IntegerField, OuterRef, Subquery, Value
+from django.db.models.functions import Coalesce
+
+from member.models import UserFollowing
+from post.models import Post, Like, Comment, Tag
+
+User = get_user_model()
+
+
+def count_of(model, field):
+    # 부모 행(OuterRef('pk'))에 연결된 자식 행의 개수를 세는 서브쿼리
+    queryset = (
+        model.objects.filter(**{field: OuterRef('pk')})
+        .order_by()
+        .values(field)
+        .annotate(count=Count('*'))
+        .values('count')
+    )
+    return Coalesce(Subquery(queryset, output_field=IntegerField()), Value(0))
+
+
+class Command(BaseCommand):
+    help = '실제 행 개수와 달라진(drift) 카운터 컬럼을 다시 계산합니다.'
+
+    # (모델, 카운터 컬럼, 자식 모델, 자식 모델의 외래키)
+    counters = [
+        (Post, 'like_count', Like, 'post'),
+        (Post, 'comment_count', Comment, 'post'),
+        (User, 'post_count', Post, 'user'),
+        (User, 'follower_count', UserFollowing, 'to_user'),
+        (User, 'following_count', UserFollowing, 'from_user'),
+        (Tag, 'post_count', Tag.posts.through, 'tag'),
+    ]
+
+    def add_arguments(self, parser):
+        parser.add_argument('--dry-run', action='store_true', help='수정하지 않고 틀어진 개수만 출력')
+
+    def handle(self, *args, **options):
+        for model, column, child_model, field in self.counters:
+            with transaction.atomic():
+                # 저장된 값과 실제 개수가 다른 행만 골라서 수정
+                drifted = list(
+                    model.objects.annotate(actual=count_of(child_model, field))
+                    .exclude(**{column: F('actual')})
+                    .values_list('pk', flat=True)
+                )
+
+                # 값을 계산한 사이에 바뀔 수 있으므로 UPDATE 문 안에서 다시 셈
+                if drifted and not options['dry_run']:
+                    model.objects.filter(pk__in=drifted).update(**{column: count_of(child_model, field)})
+
+            self.stdout.write(f'{model._meta.label}.{column}: {len(drifted)} drifted')
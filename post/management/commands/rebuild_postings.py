@@ -0,0 +1,15 @@
+from django.core.management.base import BaseCommand
+
+from post.models import Tag
+from post.postings import rebuild_postings
+
+
+class Command(BaseCommand):
+    help = '태그-글 연결로 태그별 포스팅 리스트(글 id 배열)를 다시 만듭니다.'
+
+    def handle(self, *args, **options):
+        count = 0
+        for tag in Tag.objects.only('pk').iterator():
+            rebuild_postings(tag)
+            count += 1
+        self.stdout.write(f'{count} tags rebuilt')
@@ -0,0 +1,14 @@
+from django.core.management.base import BaseCommand, CommandError
+
+from post import search
+
+
+class Command(BaseCommand):
+    help = '글 본문과 댓글로 전문 검색(FTS5) 인덱스를 다시 만듭니다.'
+
+    def handle(self, *args, **options):
+        if not search.available():
+            raise CommandError('전문 검색 인덱스는 SQLite 에서만 사용할 수 있습니다.')
+
+        search.rebuild()
+        self.stdout.write('search index rebuilt')
@@ -0,0 +1,26 @@
+from django.contrib.auth import get_user_model
+from django.core.management.base import BaseCommand
+
+from post.timeline import backfill_timeline
+
+User = get_user_model()
+
+
+class Command(BaseCommand):
+    help = '기존 글과 팔로우 관계로 유저별 타임라인을 채웁니다.'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--user', type=int, help='특정 유저(pk)의 타임라인만 채움')
+
+    def handle(self, *args, **options):
+        users = User.objects.all()
+        if options['user']:
+            users = users.filter(pk=options['user'])
+
+        for user in users.iterator():
+            # 내 글 + 내가 팔로우하는 사람들의 최근 글
+            backfill_timeline(user.pk, user)
+            for to_user in user.following.all().iterator():
+                backfill_timeline(user.pk, to_user)
+
+            self.stdout.write(f'{user}: done')
@@ -0,0 +1,29 @@
+import sqlite3
+
+from django.conf import settings
+from django.core.management.base import BaseCommand, CommandError
+from django.db import connections
+
+
+class Command(BaseCommand):
+    help = '로컬 테스트용: primary SQLite 파일을 replica 파일로 복사합니다. (복제 지연 흉내)'
+
+    def handle(self, *args, **options):
+        primary = settings.DATABASES['default']
+        replica = settings.DATABASES.get('replica')
+        if not replica or primary['ENGINE'] != 'django.db.backends.sqlite3':
+            raise CommandError('SQLite replica 설정이 없습니다. REPLICA_DB_NAME 환경 변수를 설정하세요.')
+        if str(replica['NAME']) == str(primary['NAME']):
+            raise CommandError('replica 가 primary 와 같은 파일입니다.')
+
+        connections['replica'].close()
+        # 온라인 백업 API: 쓰는 중인 primary 도 일관된 시점으로 복사됨
+        source = sqlite3.connect(primary['NAME'])
+        target = sqlite3.connect(replica['NAME'])
+        try:
+            source.backup(target)
+        finally:
+            target.close()
+            source.close()
+
+        self.stdout.write(f'{primary["NAME"]} -> {replica["NAME"]}')
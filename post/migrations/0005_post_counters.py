@@ -0,0 +1,57 @@
+# Generated by Django 5.1.15 on 2026-10-18 08:41
+
+from django.db import migrations, models
+from django.db.models import Count, IntegerField, OuterRef, Subquery, Value
+from django.db.models.functions import Coalesce
+
+
+def count_of(model, field):
+    queryset = (
+        model.objects.filter(**{field: OuterRef('pk')})
+        .order_by()
+        .values(field)
+        .annotate(count=Count('*'))
+        .values('count')
+    )
+    return Coalesce(Subquery(queryset, output_field=IntegerField()), Value(0))
+
+
+def fill_counters(apps, schema_editor):
+    # 기존 데이터의 카운터 채우기
+    Post = apps.get_model('post', 'Post')
+    Like = apps.get_model('post', 'Like')
+    Comment = apps.get_model('post', 'Comment')
+    User = apps.get_model('member', 'User')
+    UserFollowing = apps.get_model('member', 'UserFollowing')
+
+    Post.objects.update(
+        like_count=count_of(Like, 'post'),
+        comment_count=count_of(Comment, 'post'),
+    )
+    User.objects.update(
+        post_count=count_of(Post, 'user'),
+        follower_count=count_of(UserFollowing, 'to_user'),
+        following_count=count_of(UserFollowing, 'from_user'),
+    )
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('post', '0004_post_created_at_id_idx'),
+        ('member', '0004_user_counters'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='post',
+            name='comment_count',
+            field=models.PositiveIntegerField(default=0, verbose_name='댓글 수'),
+        ),
+        migrations.AddField(
+            model_name='post',
+            name='like_count',
+            field=models.PositiveIntegerField(default=0, verbose_name='좋아요 수'),
+        ),
+        migrations.RunPython(fill_counters, migrations.RunPython.noop),
+    ]
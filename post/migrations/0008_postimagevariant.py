@@ -0,0 +1,30 @@
+# Generated by Django 5.1.15 on 2026-10-18 08:44
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('post', '0007_comment_post_created_idx'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='PostImageVariant',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('image', models.ImageField(upload_to='post/variants', verbose_name='이미지')),
+                ('format', models.CharField(choices=[('webp', 'WebP'), ('jpeg', 'JPEG')], max_length=10, verbose_name='형식')),
+                ('width', models.PositiveIntegerField(verbose_name='너비')),
+                ('height', models.PositiveIntegerField(verbose_name='높이')),
+                ('post_image', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='variants', to='post.postimage')),
+            ],
+            options={
+                'verbose_name': '이미지 변환본',
+                'verbose_name_plural': '이미지 변환본 목록',
+                'ordering': ('width',),
+            },
+        ),
+    ]
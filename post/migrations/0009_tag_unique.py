@@ -0,0 +1,45 @@
+# Generated by Django 5.1.15 on 2026-10-18 08:48
+
+import unicodedata
+
+from django.db import migrations, models
+
+
+def merge_duplicate_tags(apps, schema_editor):
+    # unique 제약을 걸기 전에 태그를 정규화하고 같은 태그끼리 합침
+    Tag = apps.get_model('post', 'Tag')
+    Through = Tag.posts.through
+
+    survivors = {}
+    for tag in Tag.objects.order_by('id'):
+        name = unicodedata.normalize('NFKC', tag.tag).casefold()[:100]
+        survivor = survivors.get(name)
+
+        if survivor is None:
+            survivors[name] = tag
+            if tag.tag != name:
+                Tag.objects.filter(pk=tag.pk).update(tag=name)
+            continue
+
+        # 중복 태그의 글 연결을 남길 태그로 옮기고 삭제
+        post_ids = Through.objects.filter(tag_id=tag.pk).values_list('post_id', flat=True)
+        Through.objects.bulk_create(
+            [Through(tag_id=survivor.pk, post_id=post_id) for post_id in post_ids], ignore_conflicts=True
+        )
+        tag.delete()
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('post', '0008_postimagevariant'),
+    ]
+
+    operations = [
+        migrations.RunPython(merge_duplicate_tags, migrations.RunPython.noop),
+        migrations.AlterField(
+            model_name='tag',
+            name='tag',
+            field=models.CharField(max_length=100, unique=True, verbose_name='태그'),
+        ),
+    ]
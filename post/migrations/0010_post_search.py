@@ -0,0 +1,34 @@
+from django.db import migrations
+
+
+def create_search_table(apps, schema_editor):
+    # SQLite 에서만 FTS5 가상 테이블을 만들고 기존 글/댓글을 넣음
+    if schema_editor.connection.vendor != 'sqlite':
+        return
+
+    schema_editor.execute(
+        "CREATE VIRTUAL TABLE IF NOT EXISTS post_search "
+        "USING fts5(body, post_id UNINDEXED, tokenize='unicode61 remove_diacritics 2', prefix='2 3')"
+    )
+    schema_editor.execute("INSERT INTO post_search (rowid, body, post_id) SELECT id * 2, content, id FROM post_post")
+    schema_editor.execute(
+        "INSERT INTO post_search (rowid, body, post_id) SELECT id * 2 + 1, content, post_id FROM post_comment"
+    )
+
+
+def drop_search_table(apps, schema_editor):
+    if schema_editor.connection.vendor != 'sqlite':
+        return
+
+    schema_editor.execute("DROP TABLE IF EXISTS post_search")
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('post', '0009_tag_unique'),
+    ]
+
+    operations = [
+        migrations.RunPython(create_search_table, drop_search_table),
+    ]
@@ -0,0 +1,35 @@
+# Generated by Django 5.1.15 on 2026-10-18 08:51
+
+from django.db import migrations, models
+from django.db.models import Count, IntegerField, OuterRef, Subquery, Value
+from django.db.models.functions import Coalesce
+
+
+def fill_tag_post_count(apps, schema_editor):
+    Tag = apps.get_model('post', 'Tag')
+    Through = Tag.posts.through
+
+    counts = (
+        Through.objects.filter(tag_id=OuterRef('pk'))
+        .order_by()
+        .values('tag_id')
+        .annotate(count=Count('*'))
+        .values('count')
+    )
+    Tag.objects.update(post_count=Coalesce(Subquery(counts, output_field=IntegerField()), Value(0)))
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('post', '0010_post_search'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='tag',
+            name='post_count',
+            field=models.PositiveIntegerField(default=0, verbose_name='게시물 수'),
+        ),
+        migrations.RunPython(fill_tag_post_count, migrations.RunPython.noop),
+    ]
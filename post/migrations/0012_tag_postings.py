@@ -0,0 +1,36 @@
+# Generated by Django 5.1.15 on 2026-10-18 08:52
+
+import sys
+from array import array
+
+from django.db import migrations, models
+
+
+def fill_tag_postings(apps, schema_editor):
+    Tag = apps.get_model('post', 'Tag')
+    Through = Tag.posts.through
+
+    postings = {}
+    for tag_id, post_id in Through.objects.order_by('tag_id', 'post_id').values_list('tag_id', 'post_id').iterator():
+        postings.setdefault(tag_id, array('q')).append(post_id)
+
+    for tag_id, ids in postings.items():
+        if sys.byteorder == 'big':  # post.postings.encode() 와 같은 형식
+            ids.byteswap()
+        Tag.objects.filter(pk=tag_id).update(postings=ids.tobytes())
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('post', '0011_tag_post_count'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='tag',
+            name='postings',
+            field=models.BinaryField(default=b'', verbose_name='글 id 목록'),
+        ),
+        migrations.RunPython(fill_tag_postings, migrations.RunPython.noop),
+    ]
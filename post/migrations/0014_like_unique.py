@@ -0,0 +1,38 @@
+# Generated by Django 5.1.15 on 2026-10-18 08:57
+
+from django.conf import settings
+from django.db import migrations
+from django.db.models import Count, Min
+
+
+def remove_duplicate_likes(apps, schema_editor):
+    # unique 제약을 걸기 전에 중복 좋아요는 가장 먼저 누른 것만 남기고 좋아요 수를 다시 맞춤
+    Like = apps.get_model('post', 'Like')
+    Post = apps.get_model('post', 'Post')
+
+    duplicates = (
+        Like.objects.values('post_id', 'user_id')
+        .annotate(first_id=Min('id'), count=Count('id'))
+        .filter(count__gt=1)
+    )
+    for row in duplicates:
+        Like.objects.filter(post_id=row['post_id'], user_id=row['user_id']).exclude(pk=row['first_id']).delete()
+        Post.objects.filter(pk=row['post_id']).update(
+            like_count=Like.objects.filter(post_id=row['post_id']).count()
+        )
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('post', '0013_post_user_created_idx'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.RunPython(remove_duplicate_likes, migrations.RunPython.noop),
+        migrations.AlterUniqueTogether(
+            name='like',
+            unique_together={('post', 'user')},
+        ),
+    ]
@@ -1,10 +1,13 @@
 import re
+import unicodedata
 
 from django.contrib.auth import get_user_model
-from django.db import models
-from django.db.models.signals import post_save
+from django.db import models, transaction
+from django.db.models import F
+from django.db.models.signals import post_init, post_save, pre_delete, post_delete
 from django.dispatch import receiver
 
+from job.queue import enqueue
 from utils.models import TimestampModel
 
 User = get_user_model()
@@ -13,6 +16,12 @@ User = get_user_model()
 class Post(TimestampModel):  # utils/models.py 에서 상속 받은 모델
     content = models.TextField('본문')
     user = models.ForeignKey(User, on_delete=models.CASCADE)  # 외례키 설정, 유저 삭제시 같이 삭제
+    # 카운터 컬럼. 화면에 숫자 하나 보여주려고 모든 행을 불러오지 않도록 미리 저장해둠
+    # 값은 F() 표현식으로 DB에서 직접 증감 (python manage.py rebuild_counters 로 재계산)
+    like_count = models.PositiveIntegerField('좋아요 수', default=0)
+    comment_count = models.PositiveIntegerField('댓글 수', default=0)
+    # 피드 카드 HTML 캐시의 키. 수정/댓글/이미지가 바뀌면 1씩 올려서 이전 캐시를 버림 (좋아요 수는 캐시 밖에서 그림)
+    version = models.PositiveIntegerField('버전', default=1)
 
     def __str__(self):
         return f'[{self.user}] post'
@@ -20,6 +29,12 @@ class Post(TimestampModel):  # utils/models.py 에서 상속 받은 모델
     class Meta:
         verbose_name = '포스트'
         verbose_name_plural = '포스트 목록'
+        indexes = [
+            # 피드의 커서 페이지네이션 (created_at, id) 순서로 조회
+            models.Index(fields=['-created_at', '-id'], name='post_created_at_id_idx'),
+            # 프로필의 글 목록 (user, created_at, id) 순서로 조회
+            models.Index(fields=['user', '-created_at', '-id'], name='post_user_created_idx'),
+        ]
 
 # 이미지
 class PostImage(TimestampModel):
@@ -33,10 +48,34 @@ class PostImage(TimestampModel):
         verbose_name = '이미지'
         verbose_name_plural = '이미지 목록'
 
+# 이미지 변환본 (썸네일, WebP/JPEG)
+# 원본 대신 화면 크기에 맞는 이미지를 srcset으로 골라 받을 수 있도록 업로드 시점에 만들어둠
+class PostImageVariant(models.Model):
+    FORMAT_CHOICES = [
+        ('webp', 'WebP'),
+        ('jpeg', 'JPEG'),
+    ]
+
+    post_image = models.ForeignKey(PostImage, on_delete=models.CASCADE, related_name='variants')
+    image = models.ImageField('이미지', upload_to='post/variants')  # 파일 이름은 내용의 해시값
+    format = models.CharField('형식', max_length=10, choices=FORMAT_CHOICES)
+    width = models.PositiveIntegerField('너비')
+    height = models.PositiveIntegerField('높이')
+
+    def __str__(self):
+        return f'{self.post_image} {self.width}w {self.format}'
+
+    class Meta:
+        verbose_name = '이미지 변환본'
+        verbose_name_plural = '이미지 변환본 목록'
+        ordering = ('width',)
+
 # 태그
 class Tag(TimestampModel):
-    tag = models.CharField('태그', max_length=100)
+    tag = models.CharField('태그', max_length=100, unique=True)  # normalize_tag() 으로 정규화된 값
     posts = models.ManyToManyField(Post, related_name='tags')
+    post_count = models.PositiveIntegerField('게시물 수', default=0)  # 태그 검색 화면에 보여줄 글 수
+    postings = models.BinaryField('글 id 목록', default=b'', editable=False)  # post/postings.py 참고
 
     def __str__(self):
         return self.tag
@@ -50,38 +89,110 @@ class Comment(TimestampModel):
     def __str__(self):
         return f'[comment] {self.post} | {self.user}'
 
+    class Meta:
+        indexes = [
+            # 글마다 최신 댓글 n개 / 댓글 더보기 (created_at, id) 순서로 조회
+            models.Index(fields=['post', '-created_at', '-id'], name='comment_post_created_idx'),
+            # 글에 내가 단 댓글 조회 (post, user)
+            models.Index(fields=['post', 'user'], name='comment_post_user_idx'),
+        ]
+
 # 좋아요
 class Like(TimestampModel):
     post = models.ForeignKey(Post, related_name='likes', on_delete=models.CASCADE)
     user = models.ForeignKey(User, related_name='likes', on_delete=models.CASCADE)
 
+    class Meta:
+        # 같은 글에 한 유저의 좋아요는 하나만
+        unique_together = ('post', 'user')
+
     def __str__(self):
         return f'[comment] {self.post} | {self.user}'
 
+# 타임라인
+# 글이 작성될 때 팔로워마다 한 행씩 미리 넣어둠(fan-out-on-write).
+# 피드를 읽을 때는 내 행만 (post_created_at, post_id) 순서로 페이지 크기만큼 읽으면 됨.
+class Timeline(models.Model):
+    user = models.ForeignKey(User, on_delete=models.CASCADE, related_name='timeline')
+    post = models.ForeignKey(Post, on_delete=models.CASCADE, related_name='+')
+    post_created_at = models.DateTimeField('작성일자')  # 정렬용으로 글 작성일자를 복사해둠
+
+    def __str__(self):
+        return f'[timeline] {self.user} | {self.post_id}'
+
+    class Meta:
+        verbose_name = '타임라인'
+        verbose_name_plural = '타임라인 목록'
+        unique_together = ('user', 'post')
+        indexes = [
+            models.Index(fields=['user', '-post_created_at', '-post'], name='timeline_user_created_idx'),
+        ]
+
 # pre_save  세이브 전
 # post_save  세이브 후
+@receiver(post_init, sender=Post)
+def post_post_init(sender, instance, **kwargs):
+    # 본문이 바뀌었는지 확인하기 위해 불러올 때의 본문을 기억해둠
+    instance._loaded_content = instance.__dict__.get('content')
+
 @receiver(post_save, sender=Post)
 def post_post_save(sender, instance, created, **kwargs):
-    # 글 내용에서 태그를 찾음.
-    # r'#\w{1,100}(?=\s)'   #으로 시작하고, 텍스트가 1~100글자, 공백으로 구분되는 태그
-    hashtags = re.findall(r'#(\w{1,100})(?=\s|$)', instance.content)
+    # 작성자의 게시물 수 증가
+    if created:
+        User.objects.filter(pk=instance.user_id).update(post_count=F('post_count') + 1)
 
-    instance.tags.clear()  # 글에 연결된 태그 초기화
+    # 본문이 그대로면 태그도 그대로이므로 건너뜀
+    if not created and instance.content == instance._loaded_content:
+        return
+    instance._loaded_content = instance.content
 
-    if hashtags:
-        tags = [
-            # 태그가 있으면 가져오고 없으면 만듬.
-            Tag.objects.get_or_create(tag=hashtag) for hashtag in hashtags
-        ]
-        # 이런식으로 나옴
-        # tags = [
-        #     [Tag, False],
-        #     [Tag, True],
-        # ]
+    # 태그 연결은 요청 안에서 하지 않고 워커에서 처리 (post.tasks.index_post_tags)
+    enqueue('post.tasks.index_post_tags', instance.pk)
 
-        tags = [ tag for tag, _ in tags]  # 태그만 빼서 다시 리스트를 만듬
+def normalize_tag(tag):
+    # #Django, #django, #ＤＪＡＮＧＯ 를 같은 태그로 취급
+    return unicodedata.normalize('NFKC', tag).casefold()
 
-        instance.tags.add(*tags)  # 글에 태그 연결
+def index_tags(post):
+    # 글 내용에서 태그를 찾음.
+    # r'#\w{1,100}(?=\s)'   #으로 시작하고, 텍스트가 1~100글자, 공백으로 구분되는 태그
+    hashtags = re.findall(r'#(\w{1,100})(?=\s|$)', post.content)
+    names = {normalize_tag(hashtag)[:100] for hashtag in hashtags}
+
+    # 없는 태그만 한 번에 만듬 (이미 있으면 unique 제약 때문에 무시됨)
+    Tag.objects.bulk_create([Tag(tag=name) for name in names], ignore_conflicts=True)
+    tag_ids = set(Tag.objects.filter(tag__in=names).values_list('id', flat=True))
+
+    # 기존 연결과 비교해서 바뀐 부분만 추가/삭제
+    # 같은 글의 인덱싱 작업이 동시에 돌면 둘 다 같은 기존 연결을 보고 post_count 를 두 번 올리므로
+    # 글 행을 잠근 뒤 트랜잭션 안에서 기존 연결을 읽음 (SQLite 는 IMMEDIATE 트랜잭션이 시작할 때 쓰기 잠금을 잡음)
+    Through = Tag.posts.through
+    with transaction.atomic():
+        list(Post.objects.select_for_update().filter(pk=post.pk).values_list('pk', flat=True))
+        current = set(Through.objects.filter(post_id=post.pk).values_list('tag_id', flat=True))
+
+        added = tag_ids - current
+        removed = current - tag_ids
+        if added:
+            Through.objects.bulk_create(
+                [Through(post_id=post.pk, tag_id=tag_id) for tag_id in added], ignore_conflicts=True
+            )
+            Tag.objects.filter(pk__in=added).update(post_count=F('post_count') + 1)
+        if removed:
+            Through.objects.filter(post_id=post.pk, tag_id__in=removed).delete()
+            Tag.objects.filter(pk__in=removed, post_count__gt=0).update(post_count=F('post_count') - 1)
+
+    return added, removed
+
+@receiver(pre_delete, sender=Post)
+def post_pre_delete(sender, instance, **kwargs):
+    # 글이 삭제되면 태그 연결도 삭제되므로 연결된 태그의 게시물 수 감소
+    Tag.objects.filter(posts=instance, post_count__gt=0).update(post_count=F('post_count') - 1)
+
+@receiver(post_delete, sender=Post)
+def post_post_delete(sender, instance, **kwargs):
+    # 작성자의 게시물 수 감소
+    User.objects.filter(pk=instance.user_id, post_count__gt=0).update(post_count=F('post_count') - 1)
 
 
 
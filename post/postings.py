@@ -0,0 +1,160 @@
+import bisect
+import re
+import sys
+from array import array
+
+from django.db import transaction
+from django.db.models.signals import pre_delete
+from django.dispatch import receiver
+
+from post.models import Post, Tag, normalize_tag
+
+# 태그별 포스팅 리스트(posting list)
+# 태그가 달린 글 id를 오름차순으로 정렬해서 Tag.postings 에 8바이트 정수 배열로 저장해둠.
+# 여러 태그를 조합한 검색(#a #b, #a | #b, -#c)은 M2M 조인 대신 이 배열들을 메모리에서 교집합/합집합 함.
+
+
+def decode(data):
+    ids = array('q')
+    ids.frombytes(bytes(data or b''))
+    if sys.byteorder == 'big':  # DB에는 항상 little-endian 으로 저장
+        ids.byteswap()
+    return ids
+
+
+def encode(ids):
+    ids = array('q', ids)
+    if sys.byteorder == 'big':
+        ids.byteswap()
+    return ids.tobytes()
+
+
+def update_postings(tag_ids, post_id, add):
+    # 태그 인덱싱(index_tags)에서 바뀐 태그의 포스팅 리스트에 글 id를 넣거나 뺌
+    with transaction.atomic():
+        for tag in Tag.objects.select_for_update().filter(pk__in=tag_ids).only('postings'):
+            ids = decode(tag.postings)
+            i = bisect.bisect_left(ids, post_id)
+            found = i < len(ids) and ids[i] == post_id
+
+            if add and not found:
+                ids.insert(i, post_id)
+            elif not add and found:
+                del ids[i]
+            else:
+                continue
+
+            Tag.objects.filter(pk=tag.pk).update(postings=encode(ids))
+
+
+def gallop(ids, target, lo):
+    # lo 부터 1, 2, 4, 8 ... 칸씩 건너뛰며 target 이 있을 범위를 찾은 뒤 이분 탐색
+    # 작은 리스트와 큰 리스트를 교집합 할 때 큰 리스트를 처음부터 끝까지 훑지 않음
+    step = 1
+    hi = lo
+    while hi < len(ids) and ids[hi] < target:
+        lo = hi
+        hi += step
+        step *= 2
+    return bisect.bisect_left(ids, target, lo, min(hi + 1, len(ids)))
+
+
+def intersect(a, b):
+    if len(a) > len(b):
+        a, b = b, a
+    result = array('q')
+    j = 0
+    for value in a:
+        j = gallop(b, value, j)
+        if j == len(b):
+            break
+        if b[j] == value:
+            result.append(value)
+    return result
+
+
+def difference(a, b):
+    result = array('q')
+    j = 0
+    for value in a:
+        j = gallop(b, value, j)
+        if j == len(b) or b[j] != value:
+            result.append(value)
+    return result
+
+
+def union(a, b):
+    result = array('q')
+    i = j = 0
+    while i < len(a) and j < len(b):
+        if a[i] < b[j]:
+            result.append(a[i])
+            i += 1
+        elif a[i] > b[j]:
+            result.append(b[j])
+            j += 1
+        else:
+            result.append(a[i])
+            i += 1
+            j += 1
+    result.extend(a[i:])
+    result.extend(b[j:])
+    return result
+
+
+def parse(q):
+    # '#a #b | #c -#d' -> [(['a', 'b'], []), (['c'], ['d'])]
+    # 공백은 AND, | 는 OR, - 는 NOT
+    clauses = []
+    for part in q.split('|'):
+        include, exclude = [], []
+        for negative, name in re.findall(r'(-?)#?(\w{1,100})', part):
+            (exclude if negative else include).append(normalize_tag(name))
+        if include:
+            clauses.append((include, exclude))
+    return clauses
+
+
+def is_boolean_query(q):
+    return len(re.findall(r'\w+', q)) > 1 or '|' in q
+
+
+def evaluate(q):
+    # 조건에 맞는 글 id를 오름차순 배열로 반환
+    clauses = parse(q)
+    names = {name for include, exclude in clauses for name in include + exclude}
+    postings = {name: decode(data) for name, data in Tag.objects.filter(tag__in=names).values_list('tag', 'postings')}
+    empty = array('q')
+
+    result = array('q')
+    for include, exclude in clauses:
+        # 짧은 리스트부터 교집합 해야 중간 결과가 빨리 줄어듦
+        lists = sorted((postings.get(name, empty) for name in include), key=len)
+        ids = lists[0]
+        for other in lists[1:]:
+            if not ids:
+                break
+            ids = intersect(ids, other)
+        for name in exclude:
+            ids = difference(ids, postings.get(name, empty))
+        result = union(result, ids)
+    return result
+
+
+def page(ids, before=None, per_page=12):
+    # 최신 글(큰 id)부터 before 보다 작은 id 를 per_page 개 가져옴
+    end = bisect.bisect_left(ids, before) if before else len(ids)
+    start = max(end - per_page, 0)
+    return list(reversed(ids[start:end])), start > 0
+
+
+def rebuild_postings(tag):
+    ids = Tag.posts.through.objects.filter(tag_id=tag.pk).order_by('post_id').values_list('post_id', flat=True)
+    Tag.objects.filter(pk=tag.pk).update(postings=encode(ids))
+
+
+@receiver(pre_delete, sender=Post)
+def postings_post_pre_delete(sender, instance, **kwargs):
+    tag_ids = list(Tag.posts.through.objects.filter(post_id=instance.pk).values_list('tag_id', flat=True))
+    if tag_ids:
+        update_postings(tag_ids, instance.pk, add=False)
@@ -0,0 +1,96 @@
+import re
+
+from django.db import connection, connections, router
+from django.db.models.signals import post_save, post_delete
+from django.dispatch import receiver
+
+from post.models import Post, Comment
+
+# SQLite FTS5 전문 검색 인덱스
+# 글 본문과 댓글을 한 테이블에 넣고, 검색 결과는 글 단위로 묶어서 BM25 점수 순으로 보여줌
+# rowid 규칙: 글 = id * 2, 댓글 = id * 2 + 1  (행을 찾아서 지울 때 전체 검색 없이 rowid 로 바로 찾음)
+FTS_TABLE = 'post_search'
+
+
+def available():
+    return connection.vendor == 'sqlite'
+
+
+def index(rowid, body, post_id):
+    if not available():
+        return
+    with connection.cursor() as cursor:
+        cursor.execute(f'DELETE FROM {FTS_TABLE} WHERE rowid = %s', [rowid])
+        cursor.execute(f'INSERT INTO {FTS_TABLE} (rowid, body, post_id) VALUES (%s, %s, %s)', [rowid, body, post_id])
+
+
+def remove(rowid):
+    if not available():
+        return
+    with connection.cursor() as cursor:
+        cursor.execute(f'DELETE FROM {FTS_TABLE} WHERE rowid = %s', [rowid])
+
+
+def rebuild():
+    with connection.cursor() as cursor:
+        cursor.execute(f'DELETE FROM {FTS_TABLE}')
+        cursor.execute(
+            f'INSERT INTO {FTS_TABLE} (rowid, body, post_id) '
+            f'SELECT id * 2, content, id FROM {Post._meta.db_table}'
+        )
+        cursor.execute(
+            f'INSERT INTO {FTS_TABLE} (rowid, body, post_id) '
+            f'SELECT id * 2 + 1, content, post_id FROM {Comment._meta.db_table}'
+        )
+        cursor.execute(f"INSERT INTO {FTS_TABLE} ({FTS_TABLE}) VALUES ('optimize')")
+
+
+def build_query(q):
+    # 사용자 입력을 FTS5 문법으로 바꿈: 단어마다 접두어 검색, 모든 단어 포함(AND)
+    # "파이썬 장고" -> "파이썬"* "장고"*
+    words = re.findall(r'\w+', q)
+    return ' '.join(f'"{word}"*' for word in words)
+
+
+def search_posts(q, page=1, per_page=12):
+    # BM25 점수 순으로 글 id를 가져옴 (글과 댓글 중 가장 좋은 점수 사용)
+    # 다음 페이지가 있는지 확인하기 위해 하나 더 가져옴 (COUNT 쿼리 없음)
+    query = build_query(q)
+    if not query or not available():
+        return [], False
+
+    # 읽기 전용 화면에서는 replica 에서 검색 (utils/replica.py)
+    with connections[router.db_for_read(Post)].cursor() as cursor:
+        cursor.execute(
+            f'SELECT post_id, MIN(rank) AS score FROM ('
+            f'  SELECT post_id, rank FROM {FTS_TABLE} WHERE {FTS_TABLE} MATCH %s'
+            f') GROUP BY post_id ORDER BY score, post_id DESC LIMIT %s OFFSET %s',
+            [query, per_page + 1, (page - 1) * per_page],
+        )
+        post_ids = [row[0] for row in cursor.fetchall()]
+
+    has_next = len(post_ids) > per_page
+    post_ids = post_ids[:per_page]
+
+    posts = Post.objects.filter(pk__in=post_ids).select_related('user').prefetch_related('images__variants').in_bulk()
+    return [posts[pk] for pk in post_ids if pk in posts], has_next
+
+
+@receiver(post_save, sender=Post)
+def search_post_save(sender, instance, **kwargs):
+    index(instance.pk * 2, instance.content, instance.pk)
+
+
+@receiver(post_delete, sender=Post)
+def search_post_delete(sender, instance, **kwargs):
+    remove(instance.pk * 2)
+
+
+@receiver(post_save, sender=Comment)
+def search_comment_save(sender, instance, **kwargs):
+    index(instance.pk * 2 + 1, instance.content, instance.post_id)
+
+
+@receiver(post_delete, sender=Comment)
+def search_comment_delete(sender, instance, **kwargs):
+    remove(instance.pk * 2 + 1)
@@ -0,0 +1,31 @@
+# 워커(python manage.py runworker)에서 실행되는 작업
+# job.queue.enqueue('post.tasks.<함수 이름>', pk) 로 큐에 넣음
+# 큐에 넣은 뒤 행이 삭제됐을 수 있으므로 없으면 그냥 넘어감
+from django.db import transaction
+
+from post import images, postings, timeline
+from post.models import Post, PostImage, index_tags
+
+
+def index_post_tags(post_id):
+    post = Post.objects.filter(pk=post_id).first()
+    if post:
+        # 태그 연결과 포스팅 리스트를 함께 커밋함
+        # (따로 커밋하면 포스팅 리스트 갱신이 실패했을 때 재시도에서 바뀐 태그가 없어서 포스팅 리스트가 계속 틀린 채로 남음)
+        with transaction.atomic():
+            added, removed = index_tags(post)
+            # 바뀐 태그의 포스팅 리스트만 갱신
+            postings.update_postings(added, post.pk, add=True)
+            postings.update_postings(removed, post.pk, add=False)
+
+
+def fan_out_post(post_id):
+    post = Post.objects.filter(pk=post_id).first()
+    if post:
+        timeline.fan_out_post(post)
+
+
+def generate_image_variants(post_image_id):
+    post_image = PostImage.objects.filter(pk=post_image_id).first()
+    if post_image:
+        images.generate_variants(post_image)
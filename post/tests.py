@@ -1,3 +1,430 @@
-from django.test import TestCase
+import json
+import os
+import re
+import tempfile
+from unittest import mock, skipUnless
 
-# Create your tests here.
+from django.conf import settings
+from django.contrib.auth import get_user_model
+from django.contrib.auth.models import AnonymousUser
+from django.core.cache import cache
+from django.db import connection
+from django.test import AsyncRequestFactory, Client, TestCase
+from django.test.utils import CaptureQueriesContext, override_settings
+from django.urls import reverse
+
+from member.models import UserFollowing
+from post import async_views, likes, postings, tasks, timeline
+from post.models import Comment, Like, Post, Tag, Timeline
+
+User = get_user_model()
+
+# 전체 테이블 스캔 / 정렬용 임시 B-tree 를 찾는 패턴
+# 'SCAN post_post' 는 전체 스캔, 'SCAN post_post USING INDEX ...' 는 인덱스 순서대로 읽는 것이므로 허용
+FULL_SCAN = re.compile(r'^SCAN (\w+)$')
+TEMP_SORT = re.compile(r'USE TEMP B-TREE FOR ORDER BY')
+
+
+# 핫 패스 쿼리의 실행 계획 회귀 테스트
+# 요청에서 실행된 쿼리마다 EXPLAIN QUERY PLAN 을 돌려서 앱 테이블을 전체 스캔하거나
+# 정렬을 위해 임시 B-tree 를 만들면 실패함 (인덱스를 지우거나 쿼리가 바뀌어서 인덱스를 못 타는 경우)
+@skipUnless(connection.vendor == 'sqlite', 'EXPLAIN QUERY PLAN 형식은 SQLite 기준')
+@override_settings(PAGE_CACHE_TIMEOUT=0)  # 캐시된 페이지를 돌려주면 글 조회 쿼리가 실행되지 않음
+class QueryPlanTest(TestCase):
+    tables = {'post_post', 'post_postimage', 'post_comment', 'post_like', 'post_tag', 'post_tag_posts',
+              'post_timeline', 'member_user', 'member_userfollowing'}
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.user = User.objects.create(email='writer@example.com', nickname='writer', is_active=True)
+        cls.reader = User.objects.create(email='reader@example.com', nickname='reader', is_active=True)
+        UserFollowing.objects.create(from_user=cls.reader, to_user=cls.user)
+
+        # 태그 인덱싱(포스팅 리스트)과 타임라인 팬아웃 작업을 워커 없이 바로 실행해서 실제 피드/검색처럼 글이 보이게 함
+        with override_settings(JOB_QUEUE_EAGER=True), cls.captureOnCommitCallbacks(execute=True):
+            for i in range(30):
+                post = Post.objects.create(user=cls.user, content=f'#hot #tag{i % 3} post {i}')
+                Comment.objects.create(post=post, user=cls.reader, content=f'comment {i}')
+        cls.post = post
+
+    def plan(self, sql):
+        with connection.cursor() as cursor:
+            cursor.execute(f'EXPLAIN QUERY PLAN {sql}')
+            return [row[-1] for row in cursor.fetchall()]
+
+    def assertIndexed(self, queries):
+        checked = 0
+        for query in queries:
+            sql = query['sql']
+            if not sql.startswith(('SELECT', 'UPDATE', 'DELETE')):
+                continue
+            if not any(f'"{table}"' in sql for table in self.tables):
+                continue
+
+            checked += 1
+            for detail in self.plan(sql):
+                match = FULL_SCAN.match(detail)
+                if match and match.group(1) in self.tables:
+                    self.fail(f'full scan of {match.group(1)}:\n{sql}')
+                if TEMP_SORT.search(detail):
+                    self.fail(f'sort without index:\n{sql}')
+        self.assertGreater(checked, 0)
+
+    def capture(self, *args, method='get', **kwargs):
+        with CaptureQueriesContext(connection) as context:
+            response = getattr(self.client, method)(*args, **kwargs)
+        self.assertLess(response.status_code, 400)
+        return response, context.captured_queries
+
+    def assertShowsPosts(self, response, name='object_list'):
+        # 글이 없는 페이지면 글/대표 이미지/미리보기 댓글 조회가 실행되지 않아 검사가 의미 없음
+        self.assertTrue(list(response.context[name]))
+
+    def test_feed_anonymous(self):
+        response, queries = self.capture('/')
+        self.assertShowsPosts(response)
+        self.assertIndexed(queries)
+
+    def test_feed_timeline(self):
+        self.client.force_login(self.reader)
+        response, queries = self.capture('/')
+        self.assertShowsPosts(response)
+        self.assertIndexed(queries)
+
+    def test_profile_grid(self):
+        response, queries = self.capture('/profile/writer/')
+        self.assertShowsPosts(response, 'page_obj')
+        self.assertIndexed(queries)
+
+    def test_follow_lists(self):
+        self.client.force_login(self.reader)
+        self.assertIndexed(self.capture(f'/profile/{self.user.pk}/followers/')[1])
+        self.assertIndexed(self.capture(f'/profile/{self.reader.pk}/following/')[1])
+
+    def assertUsesIndex(self, queries, index):
+        plans = [detail for query in queries for detail in self.plan(query['sql'])]
+        self.assertTrue(any(index in detail for detail in plans), plans)
+
+    def test_tag_search(self):
+        response, queries = self.capture('/search/', {'type': 'tag', 'q': 'hot'})
+        self.assertShowsPosts(response)
+        self.assertIndexed(queries)
+        self.assertUsesIndex(queries, 'post_tag_posts_tag_id_post_id')
+
+        # 다음 페이지는 커서 이후의 글부터 이어짐
+        first = [post.pk for post in response.context['object_list']]
+        response, queries = self.capture('/search/', {
+            'type': 'tag', 'q': 'hot', 'cursor': response.context['page_obj'].next_cursor,
+        })
+        second = [post.pk for post in response.context['object_list']]
+        self.assertIndexed(queries)
+        self.assertEqual(first + second, sorted(first + second, reverse=True))
+        self.assertEqual(len(first + second), 24)
+
+    def test_comment_list(self):
+        response, queries = self.capture(f'/comment/list/{self.post.pk}')
+        self.assertTrue(response.json()['comments'])
+        self.assertIndexed(queries)
+
+    def test_like_toggle(self):
+        self.client.force_login(self.reader)
+        self.assertIndexed(self.capture('/like/', {'post_pk': self.post.pk}, method='post')[1])
+        self.assertIndexed(self.capture('/like/', {'post_pk': self.post.pk}, method='post')[1])
+        self.assertFalse(Like.objects.filter(post=self.post, user=self.reader).exists())
+
+    def test_follow_check(self):
+        self.client.force_login(self.reader)
+        _, queries = self.capture('/profile/writer/')
+        self.assertIndexed([query for query in queries if 'member_userfollowing' in query['sql']])
+
+    def test_tag_lookup(self):
+        with CaptureQueriesContext(connection) as context:
+            Tag.objects.filter(tag='hot').first()
+        self.assertIndexed(context.captured_queries)
+
+    def test_comment_by_user(self):
+        with CaptureQueriesContext(connection) as context:
+            Comment.objects.filter(post=self.post, user=self.reader).exists()
+        self.assertIndexed(context.captured_queries)
+        self.assertUsesIndex(context.captured_queries, 'comment_post_user_idx')
+
+
+class SyncLikesTest(TestCase):
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.user = User.objects.create(email='writer@example.com', nickname='writer', is_active=True)
+        cls.post = Post.objects.create(user=cls.user, content='post')
+
+    def setUp(self):
+        self.client = Client(enforce_csrf_checks=True)
+        self.client.force_login(self.user)
+        self.client.get(reverse('main'))  # csrftoken 쿠키 발급
+        self.body = json.dumps({'likes': [{'post_pk': self.post.pk, 'liked': True}]})
+
+    def sync(self, body, content_type='application/json', csrf=False):
+        headers = {'X-CSRFToken': self.client.cookies['csrftoken'].value} if csrf else {}
+        return self.client.post(reverse('sync_likes'), body, content_type=content_type, headers=headers)
+
+    def test_requires_csrf_token(self):
+        self.assertEqual(self.sync(self.body).status_code, 403)
+        self.assertFalse(Like.objects.exists())
+
+    def test_requires_json(self):
+        response = self.sync(self.body, content_type='text/plain', csrf=True)
+
+        self.assertEqual(response.status_code, 415)
+        self.assertFalse(Like.objects.exists())
+
+    def test_sync(self):
+        response = self.sync(self.body, csrf=True)
+
+        self.assertEqual(response.json(), {'likes': [{'post_pk': self.post.pk, 'liked': True, 'like_count': 1}]})
+        self.assertTrue(Like.objects.filter(post=self.post, user=self.user).exists())
+
+
+class PostCardCacheTest(TestCase):
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.user = User.objects.create(email='writer@example.com', nickname='writer', is_active=True)
+        cls.reader = User.objects.create(email='reader@example.com', nickname='reader', is_active=True)
+        cls.post = Post.objects.create(user=cls.user, content='post')
+        Comment.objects.create(post=cls.post, user=cls.reader, content='comment')
+        Post.objects.filter(pk=cls.post.pk).update(comment_count=1)
+
+    @override_settings(PAGE_CACHE_TIMEOUT=0)  # 페이지 캐시 없이 글 카드 조각 캐시만 확인
+    def test_user_info_is_not_cached(self):
+        self.assertContains(self.client.get(reverse('main')), 'writer')
+
+        # 글 버전은 그대로지만 닉네임은 바로 바뀌어야 함
+        User.objects.filter(pk=self.user.pk).update(nickname='renamed')
+        User.objects.filter(pk=self.reader.pk).update(nickname='commenter')
+        response = self.client.get(reverse('main'))
+
+        self.assertContains(response, 'renamed')
+        self.assertContains(response, 'commenter')
+        self.assertNotContains(response, 'writer')
+
+    def test_like_keeps_card_cache(self):
+        # 좋아요 수는 글 카드 캐시 밖에서 그리므로 글 버전(캐시 키)은 그대로이고, 페이지 ETag 는 바뀜
+        etag = self.client.get(reverse('main'))['ETag']
+        likes.toggle_like(self.reader, self.post.pk)
+
+        self.post.refresh_from_db()
+        self.assertEqual((self.post.version, self.post.like_count), (1, 1))
+        response = self.client.get(reverse('main'), headers={'If-None-Match': etag})
+        self.assertEqual(response.status_code, 200)
+        self.assertContains(response, '<span class="like-count">1</span>', html=False)
+
+
+@override_settings(PAGE_CACHE_TIMEOUT=60)
+class AsyncFeedTest(TestCase):
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.user = User.objects.create(email='writer@example.com', nickname='writer', is_active=True)
+        cls.post = Post.objects.create(user=cls.user, content='async post')
+
+    def setUp(self):
+        cache.clear()
+
+    async def feed(self, user=None, **headers):
+        request = AsyncRequestFactory().get('/', headers=headers)
+
+        async def auser():
+            return user or AnonymousUser()
+        request.auser = auser
+        return await async_views.feed(request)
+
+    async def test_anonymous_etag(self):
+        response = await self.feed()
+
+        self.assertEqual(response.status_code, 200)
+        self.assertIn('async post', response.content.decode())
+        self.assertIn('no-cache', response.headers['Cache-Control'])
+
+        etag = response.headers['ETag']
+        self.assertEqual((await self.feed(if_none_match=etag)).status_code, 304)
+        self.assertEqual(await cache.aget(f'page:{etag}'), response.content)
+
+        # 글이 바뀌면 ETag 도 바뀜
+        await Post.objects.filter(pk=self.post.pk).aupdate(version=2)
+        self.assertEqual((await self.feed(if_none_match=etag)).status_code, 200)
+
+    async def test_renders_inside_view(self):
+        # replica_view 안에서 렌더링을 마쳐야 템플릿 안의 조회도 같은 DB 설정을 사용함
+        response = await self.feed(self.user)
+
+        self.assertTrue(response.is_rendered)
+        self.assertNotIn('ETag', response.headers)
+
+
+# 업로드 파일 전송 (utils.media)
+class MediaServeTest(TestCase):
+    path = 'post/variants/ab/abcd.webp'  # MEDIA_IMMUTABLE_PREFIXES
+    content = bytes(range(100))
+
+    def setUp(self):
+        media_root = self.enterContext(tempfile.TemporaryDirectory())
+        self.enterContext(override_settings(MEDIA_ROOT=media_root, MEDIA_SENDFILE=None))
+        for path, content in [(self.path, self.content), ('post/2024/a.jpg', b'x' * 10)]:
+            os.makedirs(os.path.join(media_root, os.path.dirname(path)), exist_ok=True)
+            with open(os.path.join(media_root, path), 'wb') as file:
+                file.write(content)
+
+    def get(self, path=None, **headers):
+        return self.client.get(f'/media/{path or self.path}', headers=headers)
+
+    def test_full(self):
+        response = self.get()
+
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(b''.join(response.streaming_content), self.content)
+        self.assertEqual(response['Content-Type'], 'image/webp')
+        self.assertEqual(response['Accept-Ranges'], 'bytes')
+        self.assertIn('immutable', response['Cache-Control'])
+        self.assertNotIn('immutable', self.get('post/2024/a.jpg')['Cache-Control'])
+
+        response = self.get(if_modified_since=response['Last-Modified'])
+        self.assertEqual(response.status_code, 304)
+        self.assertIn('immutable', response['Cache-Control'])
+
+    def test_range(self):
+        response = self.get(range='bytes=10-19')
+
+        self.assertEqual(response.status_code, 206)
+        self.assertEqual(b''.join(response.streaming_content), self.content[10:20])
+        self.assertEqual(response['Content-Range'], 'bytes 10-19/100')
+        self.assertEqual(response['Content-Length'], '10')
+        self.assertIn('immutable', response['Cache-Control'])
+
+        self.assertEqual(b''.join(self.get(range='bytes=-5').streaming_content), self.content[95:])
+        self.assertEqual(b''.join(self.get(range='bytes=90-').streaming_content), self.content[90:])
+        self.assertEqual(b''.join(self.get(range='bytes=90-200').streaming_content), self.content[90:])
+
+    def test_ignored_range(self):
+        # 여러 구간, 형식에 맞지 않는 범위는 무시하고 전체 전송
+        for header in ['bytes=0-1,5-6', 'bytes=5-3', 'items=0-1', 'bytes=-']:
+            with self.subTest(header):
+                response = self.get(range=header)
+                self.assertEqual(response.status_code, 200)
+                self.assertEqual(b''.join(response.streaming_content), self.content)
+
+    def test_unsatisfiable_range(self):
+        response = self.get(range='bytes=200-')
+
+        self.assertEqual(response.status_code, 416)
+        self.assertEqual(response['Content-Range'], 'bytes */100')
+        self.assertNotIn('Cache-Control', response)
+
+    def test_if_range(self):
+        last_modified = self.get()['Last-Modified']
+
+        self.assertEqual(self.get(range='bytes=0-1', if_range=last_modified).status_code, 206)
+        # 파일이 바뀌었으면 전체 전송
+        response = self.get(range='bytes=0-1', if_range='Wed, 01 Jan 2020 00:00:00 GMT')
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(b''.join(response.streaming_content), self.content)
+
+    def test_not_found(self):
+        self.assertEqual(self.get('../config/base.py').status_code, 404)
+        self.assertEqual(self.get('%2e%2e/config/base.py').status_code, 404)
+        self.assertEqual(self.get('post/nope.jpg').status_code, 404)
+        self.assertEqual(self.get('post/').status_code, 404)
+
+    def test_x_accel_redirect(self):
+        with override_settings(MEDIA_SENDFILE='x-accel-redirect'):
+            response = self.get(range='bytes=0-1')
+
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response['X-Accel-Redirect'], f'/_media/{self.path}')
+        self.assertEqual(response.content, b'')
+        self.assertIn('immutable', response['Cache-Control'])
+
+    def test_x_sendfile(self):
+        with override_settings(MEDIA_SENDFILE='x-sendfile'):
+            response = self.get()
+
+        self.assertEqual(response['X-Sendfile'], os.path.join(settings.MEDIA_ROOT, self.path))
+        self.assertEqual(response.content, b'')
+
+
+@override_settings(TIMELINE_FANOUT_LIMIT=2)
+class TimelineTest(TestCase):
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.reader = User.objects.create(email='reader@example.com', nickname='reader', is_active=True)
+        cls.celebrity = User.objects.create(email='celebrity@example.com', nickname='celebrity', is_active=True)
+        writers = [
+            User.objects.create(email=f'writer{i}@example.com', nickname=f'writer{i}', is_active=True) for i in range(2)
+        ]
+        stranger = User.objects.create(email='stranger@example.com', nickname='stranger', is_active=True)
+        User.objects.filter(pk=cls.celebrity.pk).update(follower_count=2)
+        for to_user in [cls.celebrity, *writers]:
+            UserFollowing.objects.create(from_user=cls.reader, to_user=to_user)
+
+        # 셀럽의 글은 fan-out 되지 않고 읽을 때 가져옴
+        with override_settings(JOB_QUEUE_EAGER=True), cls.captureOnCommitCallbacks(execute=True):
+            for i in range(12):
+                author = [cls.celebrity, *writers, stranger][i % 4]
+                Post.objects.create(user=author, content=f'post {i}')
+
+        cls.expected = list(
+            Post.objects.exclude(user=stranger).order_by('-created_at', '-id').values_list('pk', flat=True)
+        )
+        # 셀럽이 되기 전에 fan-out 된 글: 타임라인에도 있고 읽을 때도 가져옴
+        post = Post.objects.filter(user=cls.celebrity).earliest('created_at')
+        Timeline.objects.create(user=cls.reader, post=post, post_created_at=post.created_at)
+
+    def test_fan_out_skips_celebrity(self):
+        # 일반 작성자의 글 6개 + 직접 넣은 셀럽 글 1개
+        self.assertEqual(Timeline.objects.filter(user=self.reader).count(), 7)
+        self.assertEqual(Timeline.objects.filter(user=self.reader, post__user=self.celebrity).count(), 1)
+
+    def test_merges_pulled_posts(self):
+        first = timeline.timeline_page(self.reader, per_page=4)
+        second = timeline.timeline_page(self.reader, first.next_cursor, per_page=4)
+        third = timeline.timeline_page(self.reader, second.next_cursor, per_page=4)
+        post_ids = first.object_list + second.object_list + third.object_list
+
+        # 페이지를 넘겨도 (작성일자, id) 순서가 이어지고, 타임라인과 셀럽 글에 모두 있는 글도 한 번만 나옴
+        self.assertEqual(first.object_list, self.expected[:4])
+        self.assertEqual(second.object_list, self.expected[4:8])
+        self.assertEqual(post_ids, self.expected)
+        self.assertEqual(len(set(post_ids)), len(post_ids))
+        self.assertIsNone(third.next_cursor)
+
+
+class TagIndexTest(TestCase):
+
+    def assertPostingsMatchLinks(self):
+        for tag in Tag.objects.all():
+            links = Tag.posts.through.objects.filter(tag=tag).order_by('post_id')
+            linked = list(links.values_list('post_id', flat=True))
+            self.assertEqual(list(postings.decode(tag.postings)), linked, tag.tag)
+            self.assertEqual(tag.post_count, len(linked), tag.tag)
+
+    def test_failed_postings_update_is_retried(self):
+        user = User.objects.create(email='writer@example.com', nickname='writer', is_active=True)
+        post = Post.objects.create(user=user, content='#old')
+        tasks.index_post_tags(post.pk)
+        Post.objects.filter(pk=post.pk).update(content='#new')
+
+        update_postings = postings.update_postings
+
+        def fail_on_remove(tag_ids, post_id, add):
+            if not add:
+                raise RuntimeError('postings update failed')
+            update_postings(tag_ids, post_id, add)
+
+        with mock.patch.object(postings, 'update_postings', side_effect=fail_on_remove):
+            with self.assertRaises(RuntimeError):
+                tasks.index_post_tags(post.pk)
+        self.assertPostingsMatchLinks()
+
+        # 작업 재시도
+        tasks.index_post_tags(post.pk)
+        self.assertPostingsMatchLinks()
+        self.assertEqual(list(Tag.objects.get(tag='new').posts.all()), [post])
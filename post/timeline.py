@@ -0,0 +1,107 @@
+from django.conf import settings
+from django.contrib.auth import get_user_model
+from django.db.models.signals import post_save, post_delete
+from django.dispatch import receiver
+
+from job.queue import enqueue
+from member.models import UserFollowing
+from post.models import Post, Timeline
+from utils.pagination import CursorPage, CursorPaginator, encode_cursor
+
+User = get_user_model()
+
+FANOUT_BATCH_SIZE = 1000  # 한 번에 넣을 타임라인 행 수
+BACKFILL_SIZE = 50  # 팔로우 했을 때 타임라인에 넣어줄 최근 글 수
+
+
+# 팔로워가 많은 계정(셀럽)은 fan-out 하지 않고 읽을 때 가져옴
+def is_celebrity(user):
+    return user.follower_count >= settings.TIMELINE_FANOUT_LIMIT
+
+
+def add_to_timelines(post, user_ids):
+    for start in range(0, len(user_ids), FANOUT_BATCH_SIZE):
+        Timeline.objects.bulk_create(
+            [
+                Timeline(user_id=user_id, post_id=post.pk, post_created_at=post.created_at)
+                for user_id in user_ids[start:start + FANOUT_BATCH_SIZE]
+            ],
+            ignore_conflicts=True,
+        )
+
+
+# 글 작성 시 작성자와 팔로워의 타임라인에 추가
+def fan_out_post(post):
+    user_ids = [post.user_id]
+
+    author = User.objects.only('follower_count').get(pk=post.user_id)
+    if not is_celebrity(author):
+        user_ids += list(
+            UserFollowing.objects.filter(to_user_id=post.user_id).values_list('from_user_id', flat=True)
+        )
+
+    add_to_timelines(post, user_ids)
+
+
+# 팔로우 시작 시 상대의 최근 글을 내 타임라인에 추가
+def backfill_timeline(user_id, to_user):
+    # 셀럽의 글은 읽을 때 가져오므로 넣지 않음 (내 글은 항상 넣음)
+    if to_user.pk != user_id and is_celebrity(to_user):
+        return
+
+    posts = Post.objects.filter(user=to_user).order_by('-created_at', '-id')[:BACKFILL_SIZE]
+    Timeline.objects.bulk_create(
+        [Timeline(user_id=user_id, post_id=post.pk, post_created_at=post.created_at) for post in posts],
+        ignore_conflicts=True,
+    )
+
+
+def timeline_page(user, cursor=None, per_page=5):
+    # 1. 미리 채워둔 내 타임라인
+    entries = CursorPaginator(
+        Timeline.objects.filter(user=user), per_page, ordering=('-post_created_at', '-post_id')
+    ).get_page(cursor)
+
+    # 2. 내가 팔로우하는 셀럽의 글은 읽을 때 가져옴
+    #    셀럽 수는 적기 때문에 셀럽 목록에서 내 팔로우 여부를 찾음 (팔로우 수와 무관)
+    celebrities = User.objects.filter(follower_count__gte=settings.TIMELINE_FANOUT_LIMIT).values('pk')
+    celebrity_ids = list(
+        UserFollowing.objects.filter(from_user=user, to_user__in=celebrities).values_list('to_user_id', flat=True)
+    )
+    pulled = CursorPage([])
+    if celebrity_ids:
+        pulled = CursorPaginator(
+            Post.objects.filter(user_id__in=celebrity_ids), per_page, ordering=('-created_at', '-id')
+        ).get_page(cursor)
+
+    # 3. (작성일자, 글 id) 순서로 합치고 페이지 크기만큼 자름
+    keys = {entry.post_id: entry.post_created_at for entry in entries}
+    keys.update({post.pk: post.created_at for post in pulled})
+    merged = sorted(keys.items(), key=lambda item: (item[1], item[0]), reverse=True)
+
+    page = merged[:per_page]
+    next_cursor = None
+    if len(merged) > per_page or entries.has_next() or pulled.has_next():
+        post_id, created_at = page[-1]
+        next_cursor = encode_cursor([created_at, post_id])
+
+    return CursorPage([post_id for post_id, _ in page], next_cursor)
+
+
+@receiver(post_save, sender=Post)
+def timeline_post_save(sender, instance, created, **kwargs):
+    # 팔로워가 많으면 오래 걸리므로 워커에서 처리
+    if created:
+        enqueue('post.tasks.fan_out_post', instance.pk)
+
+
+@receiver(post_save, sender=UserFollowing)
+def timeline_following_save(sender, instance, created, **kwargs):
+    if created:
+        backfill_timeline(instance.from_user_id, instance.to_user)
+
+
+@receiver(post_delete, sender=UserFollowing)
+def timeline_following_delete(sender, instance, **kwargs):
+    # 언팔로우 시 상대의 글을 내 타임라인에서 제거
+    Timeline.objects.filter(user_id=instance.from_user_id, post__user_id=instance.to_user_id).delete()
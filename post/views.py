@@ -1,25 +1,97 @@
+import json
+
 from django.contrib.auth import get_user_model
 from django.contrib.auth.decorators import login_required
 from django.contrib.auth.mixins import LoginRequiredMixin
+from django.db.models import F, Prefetch
 from django.http import HttpResponseRedirect, JsonResponse, Http404
-from django.shortcuts import render, get_object_or_404
+from django.shortcuts import render
 from django.urls import reverse
 from django.views.decorators.csrf import csrf_exempt
+from django.views.decorators.http import require_POST
 from django.views.generic import ListView, CreateView, UpdateView
 
+from member.search import search_users
+from member.suggestions import suggestions_for
+from post import likes, postings
 from post.forms import PostForm, PostImageFormSet, CommentForm
-from post.models import Post, Like
+from post.models import Post, PostImage, Like, Comment, Tag, normalize_tag
+from post.search import search_posts
+from post.timeline import timeline_page
+from utils.pagecache import AnonymousPageCacheMixin
+from utils.pagination import CursorPage, CursorPaginationMixin, CursorPaginator, decode_cursor, encode_cursor
+from utils.query import top_n_per_group
+from utils.replica import ReplicaMixin, replica_view
 
 User = get_user_model()
-class PostListView(ListView):
-    queryset = Post.objects.all().select_related('user').prefetch_related('images', 'comments', 'likes')
+
+
+def set_more_comments_cursor(posts):
+    # 미리 보여준 댓글보다 댓글이 더 있으면 가장 오래된 댓글 이전부터 더 불러올 수 있도록 커서를 달아둠
+    for post in posts:
+        post.more_comments_cursor = None
+        if post.preview_comments and post.comment_count > len(post.preview_comments):
+            oldest = post.preview_comments[-1]
+            post.more_comments_cursor = encode_cursor([oldest.created_at, oldest.pk])
+
+
+class PostListView(ReplicaMixin, AnonymousPageCacheMixin, CursorPaginationMixin, ListView):
+    queryset = Post.objects.all().select_related('user').prefetch_related('images__variants')
     template_name = 'post/list.html'
     paginate_by = 5
-    ordering = ('-created_at',)
+    comment_preview_size = 3  # 글마다 미리 보여줄 최신 댓글 수
+    ordering = ('-created_at', '-id')  # (created_at, id) 커서로 페이지를 넘김
+
+    def get_queryset(self):
+        # 댓글은 글마다 최신 n개만 불러옴. 나머지는 comment:list 에서 더 불러옴
+        preview = top_n_per_group(
+            Comment.objects.select_related('user'), 'post', ['-created_at', '-id'], self.comment_preview_size
+        )
+        return super().get_queryset().prefetch_related(
+            Prefetch('comments', queryset=preview, to_attr='preview_comments')
+        )
+
+    def get_page_etag(self):
+        # 로그인하지 않은 유저의 피드: 이 페이지에 보일 글의 (id, 버전, 좋아요 수, 닉네임)
+        if self.page_kwarg in self.request.GET and self.cursor_kwarg not in self.request.GET:
+            return None
+        queryset = Post.objects.select_related('user').only(
+            'id', 'created_at', 'version', 'like_count', 'user__nickname'
+        )
+        page = CursorPaginator(queryset, self.paginate_by, self.ordering).get_page(self.request.GET.get(self.cursor_kwarg))
+        return [[post.pk, post.version, post.like_count, post.user.nickname] for post in page] + [page.next_cursor]
+
+    def paginate_queryset(self, queryset, page_size):
+        # 로그인한 유저는 팔로우한 사람들의 글로 만든 타임라인을 보여줌
+        if not self.request.user.is_authenticated:
+            return super().paginate_queryset(queryset, page_size)
+
+        page = timeline_page(self.request.user, self.request.GET.get(self.cursor_kwarg), page_size)
+        # 타임라인 순서로 다시 늘어놓으므로 DB 에서는 정렬하지 않음
+        posts = queryset.filter(pk__in=page.object_list).order_by().in_bulk()
+        page.object_list = [posts[pk] for pk in page.object_list if pk in posts]
+        return None, page, page.object_list, page.has_next()
 
     def get_context_data(self, *args, **kwargs):
         data = super().get_context_data(*args, **kwargs)
         data['comment_form'] = CommentForm()
+
+        set_more_comments_cursor(data['object_list'])
+
+        # 현재 페이지에서 내가 좋아요 누른 글 id를 한 번의 쿼리로 가져옴
+        # 템플릿에서는 {% if post.pk in liked_post_ids %} 로 확인
+        data['liked_post_ids'] = set()
+        if self.request.user.is_authenticated:
+            data['liked_post_ids'] = set(
+                Like.objects.filter(
+                    user=self.request.user,
+                    post_id__in=[post.pk for post in data['object_list']],
+                ).values_list('post_id', flat=True)
+            )
+
+            # 추천 계정은 첫 페이지에서만 (미리 계산해둔 테이블에서 읽음)
+            if not self.request.GET.get(self.cursor_kwarg):
+                data['suggestions'] = suggestions_for(self.request.user)
         return data
 
     # select_related: 외례키일 때(참조할 때) 사용  post가 user를 참조
@@ -64,6 +136,9 @@ class PostUpdateView(LoginRequiredMixin, UpdateView):
         if image_formset.is_valid():
             image_formset.save()
 
+        # 피드에 캐시된 카드 HTML 을 다시 만들도록 버전을 올림
+        Post.objects.filter(pk=self.object.pk).update(version=F('version') + 1)
+
         return HttpResponseRedirect(reverse('main'))
 
     def get_queryset(self):
@@ -74,34 +149,98 @@ class PostUpdateView(LoginRequiredMixin, UpdateView):
 @login_required
 # def toggle_like(request, post_pk):
 def toggle_like(request):
-    post_pk = request.POST.get('post_pk')
-    if not post_pk:
+    post_pk = request.POST.get('post_pk', '')
+    if not post_pk.isdigit():
         raise Http404()
 
-    post =  get_object_or_404(Post, pk=post_pk)
-    user = request.user
-
-    like, created= Like.objects.get_or_create(user=user, post=post)
-
-    if not created:
-        like.delete()
+    # 좋아요 행과 카운터가 함께 바뀌도록 하나의 트랜잭션으로 처리 (post.likes 참고)
+    try:
+        created, like_count = likes.toggle_like(request.user, int(post_pk))
+    except Post.DoesNotExist:
+        raise Http404()
 
-    return JsonResponse({'created': created})
+    return JsonResponse({'created': created, 'like_count': like_count})
 
+# 오프라인에서 쌓아둔 좋아요를 한 번에 반영
+# body: {"likes": [{"post_pk": 1, "liked": true}, ...]}  같은 글이 여러 번 있으면 마지막 상태로 반영
+# 여러 글의 상태를 한 번에 바꾸므로 csrf 검사를 함 (클라이언트는 csrftoken 쿠키 값을 X-CSRFToken 헤더로 보냄)
+@login_required
+@require_POST
+def sync_likes(request):
+    if request.content_type != 'application/json':
+        return JsonResponse({'error': 'content type must be application/json'}, status=415)
+
+    try:
+        items = json.loads(request.body)['likes']
+        states = {int(item['post_pk']): bool(item['liked']) for item in items}
+    except (ValueError, KeyError, TypeError):
+        return JsonResponse({'error': 'invalid body'}, status=400)
+
+    like_counts = likes.sync_likes(request.user, states)
+    return JsonResponse({
+        'likes': [
+            {'post_pk': post_pk, 'liked': states[post_pk], 'like_count': like_count}
+            for post_pk, like_count in like_counts.items()
+        ]
+    })
+
+@replica_view
 def search(request):
-    search_type = request.GET.get('type')  # user, tag
+    search_type = request.GET.get('type')  # user, tag, content
     q = request.GET.get('q', '')
 
-    if search_type in ['user', 'tag']:
+    if search_type in ['user', 'tag', 'content']:
+        context = {}
         if search_type == 'user':
-            object_list = User.objects.filter(nickname__icontains=q)
+            # 정규화된 닉네임으로 접두어 검색 + trigram 중간 일치 검색
+            object_list = search_users(q)
+        elif search_type == 'tag':
+            # 태그는 unique 인덱스로 한 번에 찾고, 글 id 는 글-태그 연결 테이블의 (tag_id, post_id) 인덱스를 따라 keyset 으로 한 페이지씩 읽음
+            # (글 테이블과 조인해서 created_at 으로 정렬하면 태그의 모든 글을 정렬하게 됨.
+            #  글 id 는 작성 순서대로 커지므로 id 역순이 최신 글 순서)
+            # 여러 태그 조합(#a #b, #a | #b, -#c)은 포스팅 리스트를 메모리에서 교집합/합집합
+            # 커서에는 마지막 글 id만 넣음
+            tag = None
+            if postings.is_boolean_query(q):
+                ids = postings.evaluate(q)
+                context['result_count'] = len(ids)
+                before = decode_cursor(request.GET.get('cursor'))
+                before = before[0] if before and len(before) == 1 and isinstance(before[0], int) else None
+                post_ids, has_more = postings.page(ids, before, 12)
+                next_cursor = encode_cursor([post_ids[-1]]) if has_more else None
+            else:
+                tag = Tag.objects.filter(tag=normalize_tag(q.lstrip('#'))).first()
+                links = CursorPage([])
+                if tag:
+                    links = CursorPaginator(
+                        Tag.posts.through.objects.filter(tag=tag).only('post_id'), 12, ordering=('-post_id',)
+                    ).get_page(request.GET.get('cursor'))
+                post_ids = [link.post_id for link in links]
+                next_cursor = links.next_cursor
+
+            # 글 목록에는 대표 이미지 한 장만 필요하므로 글마다 첫 이미지만 불러옴
+            cover = top_n_per_group(PostImage.objects.prefetch_related('variants'), 'post', ['id'], 1)
+            posts = Post.objects.prefetch_related(Prefetch('images', queryset=cover, to_attr='cover_images')).in_bulk(post_ids)
+            page = CursorPage([posts[pk] for pk in post_ids if pk in posts], next_cursor)
+
+            object_list = page.object_list
+            context.update({
+                'tag': tag,
+                'page_obj': page,
+            })
         else:
-            object_list = Post.objects.filter(tags__tag=q)
-
-        context = {
-            'object_list': object_list,
-        }
+            # 본문/댓글 전문 검색 (BM25 점수 순)
+            page = request.GET.get('page', '1')
+            page = int(page) if page.isdigit() and int(page) > 0 else 1
+            object_list, has_next = search_posts(q, page)
+            context.update({
+                'page': page,
+                'previous_page': page - 1,
+                'next_page': page + 1 if has_next else None,
+            })
+
+        context['object_list'] = object_list
 
         return render(request, f'search/search_{search_type}.html', context)
 
-    return render(request, 'search/search.html')
\ No newline at end of file
+    return render(request, 'search/search.html')
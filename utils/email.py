@@ -1,9 +1,16 @@
 from django.conf import settings
-from django.core.mail import send_mail
 
+from job.models import Outbox
 
+
+# 메일을 바로 보내지 않고 보낼 메일함(outbox)에 넣음
+# 실제 발송은 python manage.py deliver_outbox 가 SMTP 연결 하나로 모아서 처리
 def send_email(subject, message, to_email):
     to_email = to_email if isinstance(to_email, list) else [to_email]
 
-    send_mail(subject, message, settings.EMAIL_HOST_USER, to_email)
-
+    return Outbox.objects.create(
+        subject=subject,
+        message=message,
+        from_email=settings.EMAIL_HOST_USER,
+        to=to_email,
+    )
@@ -0,0 +1,132 @@
+import mimetypes
+import os
+import re
+from urllib.parse import quote
+
+from django.conf import settings
+from django.core.exceptions import SuspiciousFileOperation
+from django.http import FileResponse, Http404, HttpResponse, HttpResponseNotModified
+from django.utils._os import safe_join
+from django.utils.cache import patch_cache_control
+from django.utils.http import http_date
+from django.views.static import was_modified_since
+
+# 업로드 파일(MEDIA_ROOT) 전송
+# settings.MEDIA_SENDFILE 에 따라
+#   'x-accel-redirect': 경로만 확인하고 파일 전송은 nginx 에 맡김 (MEDIA_ACCEL_PREFIX 는 nginx 의 internal location)
+#   'x-sendfile': 파일 전송을 Apache(mod_xsendfile)/lighttpd 에 맡김
+#   None: Django 가 직접 전송. FileResponse 는 gunicorn 등에서 sendfile(커널이 파일을 바로 소켓으로 복사)로 보냄
+# 어느 경우든 Range 요청(동영상 탐색, 이어받기)을 지원하고
+# 내용의 해시로 이름을 지은 파일(MEDIA_IMMUTABLE_PREFIXES)은 바뀌지 않으므로 브라우저/CDN 이 다시 확인하지 않도록 immutable 로 캐시
+
+MAX_AGE = 60 * 60 * 24
+IMMUTABLE_MAX_AGE = 60 * 60 * 24 * 365
+
+RANGE_RE = re.compile(r'^bytes=(\d*)-(\d*)$')
+
+
+class FileRange:
+    # 파일의 start 부터 length 바이트만 읽음
+    # fileno() 가 있으므로 sendfile 을 쓰는 서버는 현재 위치부터 Content-Length 만큼 바로 전송함
+    def __init__(self, file, start, length):
+        self.file = file
+        self.remaining = length
+        file.seek(start)
+
+    def read(self, size=-1):
+        if size < 0 or size > self.remaining:
+            size = self.remaining
+        data = self.file.read(size)
+        self.remaining -= len(data)
+        return data
+
+    def fileno(self):
+        return self.file.fileno()
+
+    def close(self):
+        self.file.close()
+
+
+def parse_range(header, size):
+    # 'bytes=0-99', 'bytes=100-', 'bytes=-100' 중 하나. 여러 구간이나 형식에 맞지 않는 범위(bytes=5-3)는 None (무시하고 전체 전송)
+    # 형식은 맞지만 파일 크기 때문에 범위를 만족할 수 없으면 (None, None)
+    match = RANGE_RE.match(header or '')
+    if not match or match.groups() == ('', ''):
+        return None
+
+    start, end = match.groups()
+    if start and end and int(start) > int(end):
+        return None
+    if not start:  # 끝에서부터 end 바이트
+        start, end = max(size - int(end), 0), size - 1
+    else:
+        start, end = int(start), min(int(end), size - 1) if end else size - 1
+
+    if start > end or start >= size:
+        return None, None
+    return start, end
+
+
+def serve(request, path):
+    try:
+        full_path = safe_join(settings.MEDIA_ROOT, path)
+    except SuspiciousFileOperation:
+        raise Http404()
+    if not os.path.isfile(full_path):
+        raise Http404()
+
+    stat = os.stat(full_path)
+    last_modified = http_date(stat.st_mtime)
+    if not was_modified_since(request.headers.get('If-Modified-Since'), stat.st_mtime):
+        response = HttpResponseNotModified()
+    else:
+        response = send_file(request, path, full_path, stat.st_size, last_modified)
+        response.headers['Last-Modified'] = last_modified
+        response.headers['Accept-Ranges'] = 'bytes'
+
+    # 416 같은 오류 응답은 캐시하지 않음
+    if response.status_code not in (200, 206, 304):
+        return response
+    if path.startswith(tuple(settings.MEDIA_IMMUTABLE_PREFIXES)):
+        patch_cache_control(response, public=True, max_age=IMMUTABLE_MAX_AGE, immutable=True)
+    else:
+        patch_cache_control(response, public=True, max_age=MAX_AGE)
+    return response
+
+
+def send_file(request, path, full_path, size, last_modified):
+    content_type, encoding = mimetypes.guess_type(full_path)
+    content_type = content_type or 'application/octet-stream'
+
+    # 프론트 웹 서버가 전송 (Range, sendfile 도 웹 서버가 처리)
+    if settings.MEDIA_SENDFILE == 'x-accel-redirect':
+        response = HttpResponse(content_type=content_type)
+        response.headers['X-Accel-Redirect'] = settings.MEDIA_ACCEL_PREFIX + quote(path)
+        return response
+    if settings.MEDIA_SENDFILE == 'x-sendfile':
+        response = HttpResponse(content_type=content_type)
+        response.headers['X-Sendfile'] = full_path
+        return response
+
+    # If-Range 가 있으면 파일이 그 사이에 바뀌지 않았을 때만 일부를 보냄
+    byte_range = None
+    if request.headers.get('If-Range', last_modified) == last_modified:
+        byte_range = parse_range(request.headers.get('Range'), size)
+
+    if byte_range == (None, None):
+        response = HttpResponse(status=416)
+        response.headers['Content-Range'] = f'bytes */{size}'
+        return response
+
+    file = open(full_path, 'rb')
+    if byte_range is None:
+        response = FileResponse(file, content_type=content_type)
+    else:
+        start, end = byte_range
+        response = FileResponse(FileRange(file, start, end - start + 1), status=206, content_type=content_type)
+        response.headers['Content-Length'] = end - start + 1
+        response.headers['Content-Range'] = f'bytes {start}-{end}/{size}'
+
+    if encoding:
+        response.headers['Content-Encoding'] = encoding
+    return response
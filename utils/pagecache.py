@@ -0,0 +1,83 @@
+import hashlib
+import json
+
+from asgiref.sync import sync_to_async
+from django.conf import settings
+from django.core.cache import cache
+from django.http import HttpResponse
+from django.utils.cache import get_conditional_response, patch_cache_control, quote_etag
+
+
+# 로그인하지 않은 유저의 페이지 캐시 + 조건부 GET (ETag)
+# get_page_etag() 는 화면에 보이는 글의 (id, version) 처럼 페이지 내용이 바뀌면 같이 바뀌는 값을 가볍게 조회해서 반환.
+# - 브라우저가 보낸 If-None-Match 와 같으면 렌더링 없이 304
+# - 다르면 ETag 를 키로 페이지 전체 HTML 을 캐시에서 찾고, 없으면 렌더링해서 저장
+# 글이 수정되거나 댓글이 달리면 version 이, 좋아요가 바뀌면 like_count 가 바뀌어서 ETag(=캐시 키)가 바뀌므로 따로 지울 필요가 없음
+# async 뷰는 acached_page() 를 사용 (post.async_views.feed)
+
+
+def page_etag(request, values):
+    key = json.dumps([request.get_full_path(), values], default=str)
+    return quote_etag(hashlib.sha256(key.encode()).hexdigest()[:32])
+
+
+async def acached_page(request, values, get_response):
+    # AnonymousPageCacheMixin.dispatch 의 async 버전. get_response 는 페이지를 만드는 코루틴 함수
+    etag = page_etag(request, values)
+    response = get_conditional_response(request, etag=etag)
+    if response is None:
+        timeout = settings.PAGE_CACHE_TIMEOUT
+        key = f'page:{etag}'
+
+        content = await cache.aget(key) if timeout else None
+        if content is not None:
+            response = HttpResponse(content)
+        else:
+            response = await get_response()
+            if hasattr(response, 'render'):
+                await sync_to_async(response.render)()
+            if timeout and response.status_code == 200:
+                await cache.aset(key, response.content, timeout)
+
+    response.headers['ETag'] = etag
+    patch_cache_control(response, no_cache=True)
+    return response
+
+
+class AnonymousPageCacheMixin:
+
+    def get_page_etag(self):
+        # None 이면 캐시하지 않음
+        return None
+
+    def dispatch(self, request, *args, **kwargs):
+        if request.method not in ('GET', 'HEAD') or request.user.is_authenticated:
+            return super().dispatch(request, *args, **kwargs)
+
+        values = self.get_page_etag()
+        if values is None:
+            return super().dispatch(request, *args, **kwargs)
+
+        etag = page_etag(request, values)
+        response = get_conditional_response(request, etag=etag)
+        if response is None:
+            response = self.cached_response(etag, request, *args, **kwargs)
+
+        response.headers['ETag'] = etag
+        patch_cache_control(response, no_cache=True)  # 매번 ETag 로 다시 확인
+        return response
+
+    def cached_response(self, etag, request, *args, **kwargs):
+        timeout = settings.PAGE_CACHE_TIMEOUT
+        key = f'page:{etag}'
+
+        content = cache.get(key) if timeout else None
+        if content is not None:
+            return HttpResponse(content)
+
+        response = super().dispatch(request, *args, **kwargs)
+        if hasattr(response, 'render'):
+            response.render()
+        if timeout and response.status_code == 200:
+            cache.set(key, response.content, timeout)
+        return response
@@ -0,0 +1,103 @@
+from django.core import signing
+from django.db.models import Q
+
+
+# 커서(keyset) 페이지네이션
+# ?page=N 방식은 매 요청마다 COUNT(*) 쿼리와 점점 커지는 OFFSET이 필요함.
+# 커서 방식은 마지막으로 본 행의 정렬 키 (created_at, id) 이후만 가져오기 때문에
+# 몇 페이지를 넘기든 첫 페이지와 같은 비용으로 조회할 수 있음.
+
+CURSOR_SALT = 'utils.pagination.cursor'
+
+
+def encode_cursor(values):
+    # 정렬 키 값을 클라이언트가 알 수 없는 불투명한 문자열로 만듬
+    values = [value.isoformat() if hasattr(value, 'isoformat') else value for value in values]
+    return signing.dumps(values, salt=CURSOR_SALT, compress=True)
+
+
+def decode_cursor(cursor):
+    # 잘못되거나 변조된 커서는 첫 페이지로 취급
+    if not cursor:
+        return None
+    try:
+        return signing.loads(cursor, salt=CURSOR_SALT)
+    except signing.BadSignature:
+        return None
+
+
+class CursorPage:
+    # ListView 템플릿에서 page_obj 처럼 사용할 수 있도록 has_next() 제공
+    def __init__(self, object_list, next_cursor=None):
+        self.object_list = object_list
+        self.next_cursor = next_cursor
+
+    def __iter__(self):
+        return iter(self.object_list)
+
+    def __len__(self):
+        return len(self.object_list)
+
+    def has_next(self):
+        return self.next_cursor is not None
+
+
+class CursorPaginator:
+    # ordering 예시: ('-created_at', '-id')  마지막 필드는 반드시 유일한 값이어야 함
+    def __init__(self, queryset, per_page, ordering=('-created_at', '-id')):
+        self.queryset = queryset
+        self.per_page = per_page
+        self.ordering = ordering
+
+    def get_page(self, cursor=None):
+        # 다음 페이지가 있는지 확인하기 위해 하나 더 가져옴 (COUNT 쿼리 없음)
+        return self.make_page(list(self.page_queryset(cursor)))
+
+    async def aget_page(self, cursor=None):
+        # async 뷰용 (post/async_views.py)
+        return self.make_page([obj async for obj in self.page_queryset(cursor)])
+
+    def page_queryset(self, cursor):
+        queryset = self.queryset.order_by(*self.ordering)
+
+        values = decode_cursor(cursor)
+        if values and len(values) == len(self.ordering):
+            queryset = queryset.filter(self.after(values))
+        return queryset[:self.per_page + 1]
+
+    def make_page(self, object_list):
+        next_cursor = None
+        if len(object_list) > self.per_page:
+            object_list = object_list[:self.per_page]
+            next_cursor = encode_cursor(self.key(object_list[-1]))
+
+        return CursorPage(object_list, next_cursor)
+
+    def key(self, obj):
+        return [getattr(obj, field.lstrip('-')) for field in self.ordering]
+
+    def after(self, values):
+        # (a, b) < (va, vb)  =>  a < va OR (a = va AND b < vb)
+        condition = Q()
+        equals = {}
+        for field, value in zip(self.ordering, values):
+            name = field.lstrip('-')
+            lookup = 'lt' if field.startswith('-') else 'gt'
+            condition |= Q(**equals, **{f'{name}__{lookup}': value})
+            equals[name] = value
+        return condition
+
+
+class CursorPaginationMixin:
+    # ListView에서 사용. paginate_by를 페이지 크기로 사용하고 ?cursor= 로 다음 페이지를 요청
+    cursor_kwarg = 'cursor'
+    cursor_ordering = ('-created_at', '-id')
+
+    def paginate_queryset(self, queryset, page_size):
+        # 기존 ?page=N 링크는 그대로 동작하도록 유지
+        if self.page_kwarg in self.request.GET and self.cursor_kwarg not in self.request.GET:
+            return super().paginate_queryset(queryset, page_size)
+
+        paginator = CursorPaginator(queryset, page_size, self.cursor_ordering)
+        page = paginator.get_page(self.request.GET.get(self.cursor_kwarg))
+        return paginator, page, page.object_list, page.has_next()
@@ -0,0 +1,11 @@
+from django.db.models import F, Window
+from django.db.models.functions import RowNumber
+
+
+# 그룹(예: 글)마다 상위 n개 행만 가져옴
+# ROW_NUMBER() OVER (PARTITION BY group_by ORDER BY order_by) <= n
+# prefetch_related 의 Prefetch(queryset=...) 에 넣으면 글마다 n개씩 한 번의 쿼리로 불러옴
+def top_n_per_group(queryset, group_by, order_by, n):
+    return queryset.annotate(
+        row_number=Window(RowNumber(), partition_by=F(group_by), order_by=order_by)
+    ).filter(row_number__lte=n)
@@ -0,0 +1,116 @@
+import time
+from contextlib import contextmanager
+from contextvars import ContextVar
+from functools import wraps
+
+from asgiref.sync import iscoroutinefunction, markcoroutinefunction, sync_to_async
+from django.conf import settings
+
+# 읽기 전용 화면의 조회는 replica 로 보내고 쓰기는 항상 default(primary) 로 보냄
+# 글/댓글/좋아요처럼 쓰기 요청을 한 유저는 복제가 따라올 때까지 잠시 primary 에서 읽음 (세션에 기록)
+REPLICA = 'replica'
+STICKY_SESSION_KEY = '_primary_until'
+
+_use_replica = ContextVar('use_replica', default=False)
+
+
+class ReplicaRouter:
+
+    def db_for_read(self, model, **hints):
+        if _use_replica.get() and REPLICA in settings.DATABASES:
+            return REPLICA
+        return 'default'
+
+    def db_for_write(self, model, **hints):
+        return 'default'
+
+    def allow_relation(self, obj1, obj2, **hints):
+        # replica 는 같은 데이터의 복사본이므로 어느 쪽에서 읽은 객체든 연결 가능
+        return True
+
+    def allow_migrate(self, db, app_label, model_name=None, **hints):
+        return db == 'default'
+
+
+def is_sticky(request):
+    session = getattr(request, 'session', None)
+    return session is not None and session.get(STICKY_SESSION_KEY, 0) > time.time()
+
+
+@contextmanager
+def read_replica(enabled=True):
+    token = _use_replica.set(enabled)
+    try:
+        yield
+    finally:
+        _use_replica.reset(token)
+
+
+async def ais_sticky(request):
+    session = getattr(request, 'session', None)
+    return session is not None and await session.aget(STICKY_SESSION_KEY, 0) > time.time()
+
+
+def replica_view(view):
+    # 함수 뷰용: @replica_view  (async 뷰도 사용 가능)
+    if iscoroutinefunction(view):
+        @wraps(view)
+        async def async_wrapper(request, *args, **kwargs):
+            # ContextVar 는 sync_to_async 로 실행되는 ORM 스레드에도 복사되어 전달됨
+            # TemplateResponse 는 뷰 밖에서 렌더링되므로 여기서 렌더링까지 끝냄 (템플릿 안의 조회도 replica 로)
+            with read_replica(request.method in ('GET', 'HEAD') and not await ais_sticky(request)):
+                response = await view(request, *args, **kwargs)
+                if hasattr(response, 'render'):
+                    await sync_to_async(response.render)()
+            return response
+        return async_wrapper
+
+    @wraps(view)
+    def wrapper(request, *args, **kwargs):
+        with read_replica(request.method in ('GET', 'HEAD') and not is_sticky(request)):
+            return view(request, *args, **kwargs)
+    return wrapper
+
+
+class ReplicaMixin:
+    # CBV 용. TemplateResponse 는 뷰 밖에서 렌더링되므로 여기서 렌더링까지 끝냄
+    def dispatch(self, request, *args, **kwargs):
+        with read_replica(request.method in ('GET', 'HEAD') and not is_sticky(request)):
+            response = super().dispatch(request, *args, **kwargs)
+            if hasattr(response, 'render'):
+                response.render()
+        return response
+
+
+class ReplicaStickinessMiddleware:
+    # 쓰기 요청(POST 등)이 성공하면 REPLICA_STICKY_SECONDS 동안 이 세션의 읽기를 primary 로 보냄
+    # ASGI 에서 sync 전용 미들웨어가 하나라도 있으면 async 뷰가 요청마다 한 스레드에서 차례로 실행되므로 async 도 지원
+    async_capable = True
+    sync_capable = True
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+        if iscoroutinefunction(self.get_response):
+            markcoroutinefunction(self)
+
+    def __call__(self, request):
+        if iscoroutinefunction(self):
+            return self.__acall__(request)
+
+        response = self.get_response(request)
+        session = self.sticky_session(request, response)
+        if session is not None:
+            session[STICKY_SESSION_KEY] = time.time() + settings.REPLICA_STICKY_SECONDS
+        return response
+
+    async def __acall__(self, request):
+        response = await self.get_response(request)
+        session = self.sticky_session(request, response)
+        if session is not None:
+            await session.aset(STICKY_SESSION_KEY, time.time() + settings.REPLICA_STICKY_SECONDS)
+        return response
+
+    def sticky_session(self, request, response):
+        if request.method not in ('GET', 'HEAD', 'OPTIONS') and response.status_code < 400:
+            return getattr(request, 'session', None)
+        return None